@@ -0,0 +1,315 @@
+"""Conformance and throughput check of the Python bindings against the Rust corpus.
+
+Every record written by the `corpus` binary is decoded with the exported Python
+bindings, encoded again and compared byte for byte with the JSON serde_json
+produced. Decoded records have to be instances of the generated classes all the
+way down, and lenient decoding has to produce the same value as strict decoding.
+Per type and codec mode (`lenient` uses `fromDict`, `strict` uses
+`fromDictStrict`) the throughput of both directions and the peak memory of
+holding the decoded corpus are recorded in a JSON report.
+
+Corpora using serde defaults the bindings do not match yet are marked as known
+failures in the manifest. Their mismatches are reported, but do not fail the run.
+
+Passing a previous report with `--baseline` compares the decode and encode
+throughput against it. The script exits with status 1 if a record of any other
+corpus does not decode or round-trip correctly, or a throughput dropped by more
+than `--max-regression`.
+
+    cargo test -p corpus
+    cargo run -p corpus --release -- corpus/data --records 10000
+    python3 corpus/bench.py corpus/data --output corpus/results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import gc
+import importlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin
+
+MODES = ("lenient", "strict")
+_HERE = Path(__file__).resolve().parent
+
+
+def _decoder(cls: type, mode: str) -> Callable[[Any], Any]:
+    return cls.fromDictStrict if mode == "strict" else cls.fromDict
+
+
+def _encoder(cls: type) -> Callable[[Any], str]:
+    # Structs serialize themselves, enum namespaces serialize their members.
+    serialize_into = cls.__dict__.get("_serialize_into")
+
+    def encode(value: Any) -> str:
+        if hasattr(value, "_serialize"):
+            data = value._serialize()
+        elif isinstance(serialize_into, staticmethod):
+            data = {}
+            serialize_into.__func__(value, data)
+        else:
+            data = value
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    return encode
+
+
+def _non_optional(field_type: Any) -> Any:
+    if get_origin(field_type) is Union:
+        args = [arg for arg in get_args(field_type) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return field_type
+
+
+def _undecoded(value: Any, field_type: Any = Any, path: str = "$") -> Optional[str]:
+    """Returns the path of the first JSON object within `value` which was left as a dictionary.
+
+    Objects are only expected where the type is a map. Any other field holding one
+    either has a generated class it was not decoded into, or a type which could not
+    be resolved (`Any`, e.g. a type parameter of a generic class).
+    """
+    import _ts_rs_strict  # written next to the bindings, which are only on the path in `main`
+
+    field_type = _non_optional(field_type)
+    if dataclasses.is_dataclass(value):
+        items = [("{}.{}".format(path, name), getattr(value, name), item_type)
+                 for name, item_type in _ts_rs_strict.field_types(type(value))]
+    elif isinstance(value, dict):
+        if get_origin(field_type) is not dict:
+            return path
+        item_type = get_args(field_type)[1]
+        items = [("{}[{!r}]".format(path, key), item, item_type) for key, item in value.items()]
+    elif isinstance(value, list):
+        origin, args = get_origin(field_type), get_args(field_type)
+        if origin is tuple and len(args) == len(value):
+            item_types = list(args)
+        else:
+            item_types = [args[0] if origin is list and args else Any] * len(value)
+        items = [("{}[{}]".format(path, index), item, item_type)
+                 for index, (item, item_type) in enumerate(zip(value, item_types))]
+    else:
+        return None
+    for item_path, item, item_type in items:
+        found = _undecoded(item, item_type, item_path)
+        if found:
+            return found
+    return None
+
+
+def _check(cls: type, mode: str, value: Any, data: Any) -> Optional[str]:
+    """Describes why `value`, decoded from `data`, is not what the bindings should decode."""
+    if dataclasses.is_dataclass(cls) and not isinstance(value, cls):
+        return "decoded a {} instead of {}".format(type(value).__name__, cls.__name__)
+    path = _undecoded(value)
+    if path:
+        return "{} was not decoded into a generated class".format(path)
+    if mode == "lenient":
+        try:
+            strict = cls.fromDictStrict(data)
+        except Exception as e:
+            return "strict decoding raised {}: {}".format(type(e).__name__, e)
+        if value != strict:
+            return "lenient decoding differs from strict decoding"
+    return None
+
+
+def _timed(func: Callable[[], Any], repeat: int) -> float:
+    """Returns the fastest of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def _peak_memory(decode: Callable[[Any], Any], lines: List[str]) -> int:
+    """Returns the peak memory allocated while decoding the corpus and holding all of its records."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        values = [decode(json.loads(line)) for line in lines]
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del values
+    return peak
+
+
+def _truncate(text: str, limit: int = 400) -> str:
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def run_mode(cls: type, mode: str, lines: List[str], repeat: int) -> Dict[str, Any]:
+    decode = _decoder(cls, mode)
+    encode = _encoder(cls)
+
+    mismatches = 0
+    first_mismatch: Optional[Dict[str, Any]] = None
+    for number, line in enumerate(lines, 1):
+        problem = None
+        try:
+            data = json.loads(line)
+            value = decode(data)
+            actual = encode(value)
+            problem = _check(cls, mode, value, data)
+        except Exception as e:
+            actual = "<{}: {}>".format(type(e).__name__, e)
+            problem = "raised {}".format(type(e).__name__)
+        if actual != line and problem is None:
+            problem = "does not round-trip"
+        if problem:
+            mismatches += 1
+            if first_mismatch is None:
+                first_mismatch = {
+                    "line": number,
+                    "problem": problem,
+                    "expected": _truncate(line),
+                    "actual": _truncate(actual),
+                }
+    if mismatches:
+        return {"records": len(lines), "mismatches": mismatches, "first_mismatch": first_mismatch}
+
+    values = [decode(json.loads(line)) for line in lines]
+    decode_seconds = _timed(lambda: [decode(json.loads(line)) for line in lines], repeat)
+    encode_seconds = _timed(lambda: [encode(value) for value in values], repeat)
+    del values
+
+    nbytes = sum(len(line.encode("utf-8")) for line in lines)
+    peak = _peak_memory(decode, lines)
+    return {
+        "records": len(lines),
+        "mismatches": 0,
+        "decode_seconds": decode_seconds,
+        "encode_seconds": encode_seconds,
+        "decode_records_per_second": len(lines) / decode_seconds,
+        "encode_records_per_second": len(lines) / encode_seconds,
+        "decode_mb_per_second": nbytes / decode_seconds / 1e6,
+        "encode_mb_per_second": nbytes / encode_seconds / 1e6,
+        "peak_memory_bytes": peak,
+        "peak_memory_bytes_per_record": peak / len(lines) if lines else 0.0,
+    }
+
+
+def _status(mismatches: int, known_failure: Optional[str]) -> str:
+    if not mismatches:
+        return "fixed" if known_failure else "ok"
+    return "known failure" if known_failure else "mismatch"
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """Returns a description of every throughput which dropped by more than `max_regression`."""
+    regressions = []
+    for name, result in report["results"].items():
+        for mode, current in result["modes"].items():
+            previous = baseline.get("results", {}).get(name, {}).get("modes", {}).get(mode)
+            if not previous:
+                continue
+            for metric in ("decode_records_per_second", "encode_records_per_second"):
+                if metric not in current or metric not in previous:
+                    continue
+                ratio = current[metric] / previous[metric]
+                current.setdefault("baseline_ratio", {})[metric] = ratio
+                if ratio < 1.0 - max_regression:
+                    regressions.append(
+                        "{} {} {}: {:.0f} -> {:.0f} ({:+.1%})".format(
+                            name, mode, metric, previous[metric], current[metric], ratio - 1.0
+                        )
+                    )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("corpus", nargs="?", default=str(_HERE / "data"),
+                        help="directory written by the corpus binary")
+    parser.add_argument("--bindings", default=str(_HERE / "py_bindings"),
+                        help="directory of the exported Python bindings")
+    parser.add_argument("--output", default=str(_HERE / "results.json"),
+                        help="path of the JSON report")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help="comma separated codec modes to run")
+    parser.add_argument("--types", default=None,
+                        help="comma separated types to run, defaults to all of the corpus")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timed runs per measurement, the fastest one is reported")
+    parser.add_argument("--baseline", default=None,
+                        help="previous report to compare the throughput against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="tolerated relative throughput drop compared to the baseline")
+    args = parser.parse_args(argv)
+
+    modes = [mode for mode in args.modes.split(",") if mode]
+    for mode in modes:
+        if mode not in MODES:
+            parser.error("unknown mode {!r}, expected one of {}".format(mode, ", ".join(MODES)))
+
+    corpus_dir = Path(args.corpus)
+    manifest = json.loads((corpus_dir / "manifest.json").read_text(encoding="utf-8"))
+    names = args.types.split(",") if args.types else list(manifest["corpora"])
+    sys.path.insert(0, str(Path(args.bindings).resolve()))
+
+    report: Dict[str, Any] = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "seed": manifest["seed"],
+        "repeat": args.repeat,
+        "results": {},
+    }
+    failed = False
+    for name in names:
+        entry = manifest["corpora"][name]
+        cls = getattr(importlib.import_module(name), name)
+        with open(corpus_dir / entry["file"], encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+        known_failure = entry.get("known_failure")
+        result = {"shape": entry["shape"], "records": len(lines), "bytes": entry["bytes"],
+                  "known_failure": known_failure, "modes": {}}
+        for mode in modes:
+            stats = result["modes"][mode] = run_mode(cls, mode, lines, args.repeat)
+            stats["status"] = _status(stats["mismatches"], known_failure)
+            if stats["mismatches"]:
+                failed = failed or not known_failure
+                first = stats["first_mismatch"]
+                print("{:<10} {:<8} {}: {} of {} records mismatch, first at line {}: {}".format(
+                    name, mode, stats["status"], stats["mismatches"], len(lines), first["line"],
+                    first["problem"]))
+            else:
+                if known_failure:
+                    print("{:<10} {:<8} fixed: passes although marked as a known failure ({})".format(
+                        name, mode, known_failure))
+                print("{:<10} {:<8} decode {:>9.0f} rec/s {:>7.2f} MB/s  encode {:>9.0f} rec/s {:>7.2f} MB/s  "
+                      "peak {:>7.1f} MiB".format(
+                          name, mode,
+                          stats["decode_records_per_second"], stats["decode_mb_per_second"],
+                          stats["encode_records_per_second"], stats["encode_mb_per_second"],
+                          stats["peak_memory_bytes"] / 2 ** 20))
+        report["results"][name] = result
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.max_regression)
+        report["regressions"] = regressions
+        for regression in regressions:
+            print("regression: " + regression)
+        failed = failed or bool(regressions)
+
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print("report written to {}".format(args.output))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,464 @@
+//! Types of the cross-language corpus and deterministic generators for their values.
+//!
+//! Every corpus exercises one shape the Python bindings have to handle: deeply nested structs,
+//! generic types, internally tagged enums, sparse optional fields and flattened fields.
+//! Values are serialized with serde_json, so the corpus is what a Rust service would send.
+//!
+//! The types of the corpora above avoid serde behaviour the bindings do not match yet. The
+//! remaining corpora use serde's defaults instead and are marked as known failures, so that the
+//! differences show up in every report.
+#![allow(dead_code)]
+
+use std::collections::BTreeMap;
+
+use serde::Serialize;
+use ts_rs::{Py, TS};
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub enum Country {
+    De,
+    Fr,
+    Jp,
+    Us,
+}
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Address {
+    pub street: String,
+    pub city: String,
+    pub country: Country,
+}
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Customer {
+    pub id: u64,
+    pub name: String,
+    #[py(intern)]
+    pub segment: String,
+    pub address: Address,
+}
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct OrderLine {
+    pub sku: String,
+    pub quantity: u32,
+    pub unit_price: f64,
+}
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Order {
+    pub id: u64,
+    pub customer: Customer,
+    pub lines: Vec<OrderLine>,
+    #[py(intern)]
+    pub tags: Vec<String>,
+    pub attributes: BTreeMap<String, String>,
+}
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Page<T> {
+    pub items: Vec<T>,
+    pub total: u64,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub cursor: Option<String>,
+}
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+#[serde(tag = "type")]
+pub enum Event {
+    Created {
+        id: u64,
+        country: Country,
+    },
+    Moved {
+        id: u64,
+        x: i32,
+        y: i32,
+    },
+    Tagged {
+        id: u64,
+        #[py(intern)]
+        label: String,
+    },
+    Rated {
+        id: u64,
+        score: f32,
+    },
+}
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Timeline {
+    pub id: u64,
+    pub events: Vec<Event>,
+}
+
+// The Python encoders omit `None`, so absent values are skipped on the Rust side as well.
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Sparse {
+    pub id: u64,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub name: Option<String>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub email: Option<String>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub age: Option<u8>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub score: Option<f64>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub active: Option<bool>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub country: Option<Country>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub tags: Option<Vec<String>>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub address: Option<Address>,
+}
+
+// Flattened fields are written after the fields of the struct itself, in both languages.
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Shipment {
+    pub id: u64,
+    pub weight: f64,
+    #[serde(flatten)]
+    pub destination: Address,
+}
+
+// serde's defaults: `None` is written as `null`, while the Python encoders omit it.
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Profile {
+    pub id: u64,
+    pub nickname: Option<String>,
+    pub age: Option<u8>,
+    pub address: Option<Address>,
+}
+
+// Externally tagged, serde's default representation of enums. The Python bindings expect the
+// variant under a "type" key instead.
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub enum Payment {
+    Cash,
+    Card { last4: String, expiry: String },
+    Transfer { iban: String },
+}
+
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Invoice {
+    pub id: u64,
+    pub amount: f64,
+    pub payment: Payment,
+}
+
+// serde writes the fields of a flattened value where the field is declared, while the Python
+// encoders write them after the fields of the struct itself.
+#[derive(TS, Py, Serialize)]
+#[ts(export)]
+#[py(export)]
+pub struct Parcel {
+    #[serde(flatten)]
+    pub origin: Address,
+    pub id: u64,
+    pub weight: f64,
+}
+
+/// A small, deterministic PRNG (SplitMix64), so a seed always produces the same corpus.
+pub struct Rng(u64);
+
+impl Rng {
+    pub fn new(seed: u64) -> Self {
+        Self(seed)
+    }
+
+    pub fn next_u64(&mut self) -> u64 {
+        self.0 = self.0.wrapping_add(0x9E37_79B9_7F4A_7C15);
+        let mut z = self.0;
+        z = (z ^ (z >> 30)).wrapping_mul(0xBF58_476D_1CE4_E5B9);
+        z = (z ^ (z >> 27)).wrapping_mul(0x94D0_49BB_1331_11EB);
+        z ^ (z >> 31)
+    }
+
+    /// Returns a number in `0..n`.
+    pub fn below(&mut self, n: u64) -> u64 {
+        self.next_u64() % n
+    }
+
+    pub fn chance(&mut self, percent: u64) -> bool {
+        self.below(100) < percent
+    }
+
+    pub fn pick<'a, T>(&mut self, items: &'a [T]) -> &'a T {
+        &items[self.below(items.len() as u64) as usize]
+    }
+}
+
+/// A corpus of records of one exported type.
+pub struct Corpus {
+    /// Name of the exported Python class decoding the records.
+    pub name: &'static str,
+    /// Which shape of type the corpus exercises.
+    pub shape: &'static str,
+    /// Generates a single record, serialized as one line of JSON.
+    pub generate: fn(&mut Rng) -> String,
+    /// Why the records are expected not to round-trip, if they are.
+    pub known_failure: Option<&'static str>,
+}
+
+pub const CORPORA: &[Corpus] = &[
+    Corpus {
+        name: "Order",
+        shape: "nested",
+        generate: |rng| json(&order(rng)),
+        known_failure: None,
+    },
+    Corpus {
+        name: "Page",
+        shape: "generic",
+        generate: |rng| json(&page(rng)),
+        known_failure: Some("type parameters are not resolved, so `items` are left as dictionaries"),
+    },
+    Corpus {
+        name: "Timeline",
+        shape: "enum-heavy",
+        generate: |rng| json(&timeline(rng)),
+        known_failure: None,
+    },
+    Corpus {
+        name: "Sparse",
+        shape: "optional-sparse",
+        generate: |rng| json(&sparse(rng)),
+        known_failure: None,
+    },
+    Corpus {
+        name: "Shipment",
+        shape: "flattened",
+        generate: |rng| json(&shipment(rng)),
+        known_failure: None,
+    },
+    Corpus {
+        name: "Profile",
+        shape: "serde-nulls",
+        generate: |rng| json(&profile(rng)),
+        known_failure: Some("`None` is written as `null` by serde and omitted by Python"),
+    },
+    Corpus {
+        name: "Invoice",
+        shape: "external-enum",
+        generate: |rng| json(&invoice(rng)),
+        known_failure: Some("externally tagged enums are decoded as internally tagged ones"),
+    },
+    Corpus {
+        name: "Parcel",
+        shape: "flatten-first",
+        generate: |rng| json(&parcel(rng)),
+        known_failure: Some("flattened fields are written after the fields of the struct"),
+    },
+];
+
+impl Corpus {
+    /// Seed of this corpus, so that every corpus is independent of which others are generated.
+    pub fn seed(&self, seed: u64) -> u64 {
+        // FNV-1a
+        self.name
+            .bytes()
+            .fold(0xCBF2_9CE4_8422_2325 ^ seed, |hash, byte| {
+                (hash ^ byte as u64).wrapping_mul(0x0100_0000_01B3)
+            })
+    }
+}
+
+fn json(value: &impl Serialize) -> String {
+    serde_json::to_string(value).expect("corpus values are serializable")
+}
+
+const WORDS: &[&str] = &[
+    "alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliett",
+    "kilo", "lima", "mike", "november", "oscar", "papa",
+];
+const NAMES: &[&str] = &[
+    "Ada Lovelace",
+    "Zoë Ørsted",
+    "Łukasz Żółw",
+    "山田 太郎",
+    "José \"Pepe\" Núñez",
+    "Grace Hopper",
+    "Нияз\tAli",
+    "back\\slash",
+];
+const CITIES: &[&str] = &["Berlin", "Paris", "東京", "Zürich", "New York", "São Paulo"];
+const SEGMENTS: &[&str] = &["retail", "wholesale", "enterprise", "public"];
+
+fn word(rng: &mut Rng) -> String {
+    rng.pick(WORDS).to_string()
+}
+
+fn words(rng: &mut Rng, max: u64) -> Vec<String> {
+    (0..rng.below(max + 1)).map(|_| word(rng)).collect()
+}
+
+fn country(rng: &mut Rng) -> Country {
+    match rng.below(4) {
+        0 => Country::De,
+        1 => Country::Fr,
+        2 => Country::Jp,
+        _ => Country::Us,
+    }
+}
+
+// Amounts are whole cents, so they print the same in Rust and in Python.
+fn amount(rng: &mut Rng) -> f64 {
+    rng.below(10_000_000) as f64 / 100.0
+}
+
+fn address(rng: &mut Rng) -> Address {
+    Address {
+        street: format!("{} {}", rng.below(1000), word(rng)),
+        city: rng.pick(CITIES).to_string(),
+        country: country(rng),
+    }
+}
+
+fn order_line(rng: &mut Rng) -> OrderLine {
+    OrderLine {
+        sku: format!("{}-{:05}", word(rng).to_uppercase(), rng.below(100_000)),
+        quantity: rng.below(50) as u32 + 1,
+        unit_price: amount(rng),
+    }
+}
+
+fn order(rng: &mut Rng) -> Order {
+    Order {
+        id: rng.next_u64() >> 11,
+        customer: Customer {
+            id: rng.below(1_000_000),
+            name: rng.pick(NAMES).to_string(),
+            segment: rng.pick(SEGMENTS).to_string(),
+            address: address(rng),
+        },
+        lines: (0..rng.below(8) + 1).map(|_| order_line(rng)).collect(),
+        tags: words(rng, 4),
+        attributes: (0..rng.below(4))
+            .map(|_| (word(rng), format!("{}", rng.below(1000))))
+            .collect(),
+    }
+}
+
+fn page(rng: &mut Rng) -> Page<OrderLine> {
+    let items: Vec<_> = (0..rng.below(20)).map(|_| order_line(rng)).collect();
+    Page {
+        total: items.len() as u64 + rng.below(1000),
+        cursor: rng.chance(70).then(|| format!("{:016x}", rng.next_u64())),
+        items,
+    }
+}
+
+fn event(rng: &mut Rng) -> Event {
+    let id = rng.below(1_000_000);
+    match rng.below(4) {
+        0 => Event::Created {
+            id,
+            country: country(rng),
+        },
+        1 => Event::Moved {
+            id,
+            x: rng.below(2000) as i32 - 1000,
+            y: rng.below(2000) as i32 - 1000,
+        },
+        2 => Event::Tagged {
+            id,
+            label: word(rng),
+        },
+        _ => Event::Rated {
+            id,
+            score: rng.below(21) as f32 / 4.0,
+        },
+    }
+}
+
+fn timeline(rng: &mut Rng) -> Timeline {
+    Timeline {
+        id: rng.below(1_000_000),
+        events: (0..rng.below(32) + 1).map(|_| event(rng)).collect(),
+    }
+}
+
+// Every optional field is present in roughly one out of five records.
+fn sparse(rng: &mut Rng) -> Sparse {
+    Sparse {
+        id: rng.below(1_000_000),
+        name: rng.chance(20).then(|| rng.pick(NAMES).to_string()),
+        email: rng.chance(20).then(|| format!("{}@example.com", word(rng))),
+        age: rng.chance(20).then(|| rng.below(100) as u8),
+        score: rng.chance(20).then(|| amount(rng)),
+        active: rng.chance(20).then(|| rng.chance(50)),
+        country: rng.chance(20).then(|| country(rng)),
+        tags: rng.chance(20).then(|| words(rng, 3)),
+        address: rng.chance(20).then(|| address(rng)),
+    }
+}
+
+fn shipment(rng: &mut Rng) -> Shipment {
+    Shipment {
+        id: rng.below(1_000_000),
+        weight: amount(rng),
+        destination: address(rng),
+    }
+}
+
+fn profile(rng: &mut Rng) -> Profile {
+    Profile {
+        id: rng.below(1_000_000),
+        nickname: rng.chance(50).then(|| word(rng)),
+        age: rng.chance(50).then(|| rng.below(100) as u8),
+        address: rng.chance(50).then(|| address(rng)),
+    }
+}
+
+fn invoice(rng: &mut Rng) -> Invoice {
+    Invoice {
+        id: rng.below(1_000_000),
+        amount: amount(rng),
+        payment: match rng.below(3) {
+            0 => Payment::Cash,
+            1 => Payment::Card {
+                last4: format!("{:04}", rng.below(10_000)),
+                expiry: format!("{:02}/{:02}", rng.below(12) + 1, rng.below(10) + 26),
+            },
+            _ => Payment::Transfer {
+                iban: format!("DE{:020}", rng.below(u64::MAX / 2)),
+            },
+        },
+    }
+}
+
+fn parcel(rng: &mut Rng) -> Parcel {
+    Parcel {
+        origin: address(rng),
+        id: rng.below(1_000_000),
+        weight: amount(rng),
+    }
+}
@@ -0,0 +1,84 @@
+//! Writes the corpora to `<OUT_DIR>/<Type>.jsonl`, one record per line, together with a
+//! `manifest.json` describing them.
+//!
+//! Usage: `cargo run -p corpus --release -- [OUT_DIR] [--records N] [--seed SEED]`
+
+use std::{
+    fs::{self, File},
+    io::{BufWriter, Write},
+    path::PathBuf,
+    process::exit,
+};
+
+use corpus::{Rng, CORPORA};
+use serde_json::json;
+
+const USAGE: &str = "usage: corpus [OUT_DIR] [--records N] [--seed SEED]";
+
+fn main() -> std::io::Result<()> {
+    let mut out_dir = PathBuf::from("corpus/data");
+    let mut records = 10_000u64;
+    let mut seed = 0x7572_7573u64;
+
+    let mut args = std::env::args().skip(1);
+    while let Some(arg) = args.next() {
+        match arg.as_str() {
+            "--records" => records = number(args.next()),
+            "--seed" => seed = number(args.next()),
+            "-h" | "--help" => {
+                println!("{USAGE}");
+                return Ok(());
+            }
+            _ if arg.starts_with('-') => fail(&format!("unknown option {arg}")),
+            _ => out_dir = PathBuf::from(arg),
+        }
+    }
+
+    fs::create_dir_all(&out_dir)?;
+    let mut corpora = serde_json::Map::new();
+    for corpus in CORPORA {
+        let file = format!("{}.jsonl", corpus.name);
+        let mut out = BufWriter::new(File::create(out_dir.join(&file))?);
+        let mut rng = Rng::new(corpus.seed(seed));
+        let mut bytes = 0;
+        for _ in 0..records {
+            let line = (corpus.generate)(&mut rng);
+            bytes += line.len() + 1;
+            writeln!(out, "{line}")?;
+        }
+        out.flush()?;
+
+        println!(
+            "{:<10} {:>16} {:>10} records {:>12} bytes",
+            corpus.name, corpus.shape, records, bytes
+        );
+        corpora.insert(
+            corpus.name.to_owned(),
+            json!({
+                "shape": corpus.shape,
+                "file": file,
+                "records": records,
+                "bytes": bytes,
+                "known_failure": corpus.known_failure,
+            }),
+        );
+    }
+
+    let manifest = json!({ "seed": seed, "records": records, "corpora": corpora });
+    fs::write(
+        out_dir.join("manifest.json"),
+        serde_json::to_string_pretty(&manifest)? + "\n",
+    )
+}
+
+fn number(arg: Option<String>) -> u64 {
+    match arg.as_deref().map(str::parse) {
+        Some(Ok(n)) => n,
+        _ => fail("expected a number"),
+    }
+}
+
+fn fail(message: &str) -> ! {
+    eprintln!("{message}\n{USAGE}");
+    exit(2)
+}
@@ -3,8 +3,8 @@ use std::collections::{HashMap, HashSet};
 use proc_macro2::{Ident, TokenStream};
 use quote::{format_ident, quote};
 use syn::{
-    parse_quote, spanned::Spanned, ConstParam, GenericParam, Generics, Item, LifetimeParam, Path,
-    Result, Type, TypeParam, WhereClause, WherePredicate,
+    parse_quote, parse_quote_spanned, spanned::Spanned, ConstParam, GenericParam, Generics, Item,
+    LifetimeParam, Path, Result, Type, TypeParam, WhereClause, WherePredicate,
 };
 
 use crate::{deps::Dependencies, utils::format_generics};
@@ -22,7 +22,11 @@ struct DerivedPy {
     docs: String,
     inline: TokenStream,
     py_definition: TokenStream,
+    // Set if the type implements `PyFlatten`, i.e. it can be flattened into a dataclass
     inline_flattened: Option<TokenStream>,
+    // Types of the flattened fields, which have to implement `PyFlatten`
+    flattened: Vec<Type>,
+    column_kind: Option<String>,
     dependencies: Dependencies,
     concrete: HashMap<Ident, Type>,
     bound: Option<Vec<WherePredicate>>,
@@ -71,13 +75,28 @@ impl DerivedPy {
         let crate_rename = self.crate_rename.clone();
 
         let ident = self.py_name.clone();
+        let flatten_bounds = self.flatten_bounds(&generics);
         let impl_start = generate_impl_block_header(
             &crate_rename,
+            quote!(#crate_rename::Py),
             &rust_ty,
             &generics,
             self.bound.as_deref(),
             &self.dependencies,
+            &flatten_bounds,
         );
+        let flatten_impl = self.inline_flattened.is_some().then(|| {
+            let impl_start = generate_impl_block_header(
+                &crate_rename,
+                quote!(#crate_rename::py::PyFlatten),
+                &rust_ty,
+                &generics,
+                self.bound.as_deref(),
+                &self.dependencies,
+                &[],
+            );
+            quote!(#impl_start {})
+        });
         let assoc_type = generate_assoc_type(&rust_ty, &crate_rename, &generics, &self.concrete);
         let name = self.generate_name_fn(&generics);
         let inline = self.generate_inline_fn();
@@ -85,6 +104,13 @@ impl DerivedPy {
         let definition = self.generate_definition_fn();
         let dependencies = &self.dependencies;
         let generics_fn = self.generate_generics_fn(&generics);
+        let column_kind = self.column_kind.as_ref().map(|kind| {
+            quote! {
+                fn column_kind() -> String {
+                    #kind.to_owned()
+                }
+            }
+        });
 
         quote! {
             #impl_start {
@@ -102,6 +128,7 @@ impl DerivedPy {
                 #definition
                 #generics_fn
                 #output_path_fn
+                #column_kind
 
                 fn visit_dependencies(v: &mut impl #crate_rename::py::PyTypeVisitor)
                 where
@@ -111,10 +138,28 @@ impl DerivedPy {
                 }
             }
 
+            #flatten_impl
             #export
         }
     }
 
+    /// Requires the types of flattened fields to implement `PyFlatten`, so that fields which
+    /// cannot be flattened are rejected at compile time. Types using type parameters are skipped,
+    /// since the dummy types substituted for them on export cannot be flattened.
+    fn flatten_bounds(&self, generics: &Generics) -> Vec<WherePredicate> {
+        let crate_rename = &self.crate_rename;
+        let is_type_param = |id: &Ident| generics.type_params().any(|p| &p.ident == id);
+        self.flattened
+            .iter()
+            .filter(|ty| {
+                let mut used = HashSet::new();
+                crate::used_type_params(&mut used, ty, is_type_param);
+                used.is_empty()
+            })
+            .map(|ty| parse_quote_spanned!(ty.span()=> #ty: #crate_rename::py::PyFlatten))
+            .collect()
+    }
+
     /// Returns an expression which evaluates to the Python name of the type, including generic
     /// parameters.
     fn name_with_generics(&self, generics: &Generics) -> TokenStream {
@@ -161,6 +206,17 @@ impl DerivedPy {
                     fn inline_flattened() -> String { stringify!(#generics).to_owned() }
                     fn decl() -> String { panic!("{} cannot be declared", #name) }
                     fn decl_concrete() -> String { panic!("{} cannot be declared", #name) }
+                    fn definition() -> String { panic!("{} cannot provide a definition", #name) }
+                }
+                // `Py` implementations require their type parameters to implement `TS` as well
+                impl #crate_rename::TS for #generics {
+                    type WithoutGenerics = #generics;
+                    type OptionInnerType = Self;
+                    fn name() -> String { stringify!(#generics).to_owned() }
+                    fn inline() -> String { panic!("{} cannot be inlined", #name) }
+                    fn inline_flattened() -> String { stringify!(#generics).to_owned() }
+                    fn decl() -> String { panic!("{} cannot be declared", #name) }
+                    fn decl_concrete() -> String { panic!("{} cannot be declared", #name) }
                 }
             )*
         }
@@ -320,10 +376,12 @@ fn generate_assoc_type(
 
 fn generate_impl_block_header(
     crate_rename: &Path,
+    trait_path: TokenStream,
     ty: &Ident,
     generics: &Generics,
     bounds: Option<&[WherePredicate]>,
     dependencies: &Dependencies,
+    extra_bounds: &[WherePredicate],
 ) -> TokenStream {
     use GenericParam as G;
 
@@ -354,14 +412,15 @@ fn generate_impl_block_header(
     });
 
     let where_bound = match bounds {
-        Some(bounds) => quote! { where #(#bounds),* },
+        Some(bounds) => quote! { where #(#bounds,)* #(#extra_bounds),* },
         None => {
-            let bounds = generate_where_clause(crate_rename, generics, dependencies);
+            let mut bounds = generate_where_clause(crate_rename, generics, dependencies);
+            bounds.predicates.extend(extra_bounds.iter().cloned());
             quote! { #bounds }
         }
     };
 
-    quote!(impl <#(#params),*> #crate_rename::Py for #ty <#(#type_args),*> #where_bound)
+    quote!(impl <#(#params),*> #trait_path for #ty <#(#type_args),*> #where_bound)
 }
 
 fn generate_where_clause(
@@ -379,9 +438,10 @@ fn generate_where_clause(
         used_types.into_iter()
     };
 
+    // The generated `visit_dependencies` goes through `TS`, see `Dependencies`.
     let existing = generics.where_clause.iter().flat_map(|w| &w.predicates);
     parse_quote! {
-        where #(#existing,)* #(#used_types: #crate_rename::Py),*
+        where #(#existing,)* #(#used_types: #crate_rename::Py + #crate_rename::TS),*
     }
 }
 
@@ -465,6 +525,199 @@ fn process_py_attribute(attr: &syn::Attribute, py: &mut DerivedPy) -> Result<()>
 // Helper functions for py_struct_def
 // ====================================
 
+// A field of a generated dataclass
+struct PyField {
+    name: String,
+    ty: Type,
+    // `#[serde(flatten)]`, `#[ts(flatten)]` or `#[py(flatten)]`
+    flatten: bool,
+    // `#[py(intern)]`
+    intern: bool,
+}
+
+impl PyField {
+    fn new(name: String, field: &syn::Field) -> Result<Self> {
+        let mut flatten = false;
+        let mut intern = false;
+        for attr in &field.attrs {
+            let is_py = attr.path().is_ident("py");
+            if !is_py && !attr.path().is_ident("serde") && !attr.path().is_ident("ts") {
+                continue;
+            }
+            // Other arguments are skipped, errors are reported by the derive owning the attribute
+            let _ = attr.parse_nested_meta(|meta| {
+                if meta.path.is_ident("flatten") {
+                    flatten = true;
+                } else if is_py && meta.path.is_ident("intern") {
+                    intern = true;
+                } else if meta.input.peek(syn::Token![=]) {
+                    meta.value()?.parse::<syn::Expr>()?;
+                } else if meta.input.peek(syn::token::Paren) {
+                    let _content;
+                    syn::parenthesized!(_content in meta.input);
+                }
+                Ok(())
+            });
+        }
+        if intern && intern_expr(&field.ty, "value", 0, true).is_none() {
+            syn_err_spanned!(field; "#[py(intern)] is only supported on fields containing strings");
+        }
+        Ok(Self {
+            name,
+            ty: field.ty.clone(),
+            flatten,
+            intern,
+        })
+    }
+}
+
+// Placeholder for the class of a flattened field of the class `owner`, replaced when the bindings
+// are exported
+fn flatten_marker(owner: &str, field_name: &str) -> String {
+    format!("__ts_rs_flatten_{}_{}__", owner, field_name)
+}
+
+// Formats the names as a Python tuple of strings
+fn python_tuple(names: &[String]) -> String {
+    match names {
+        [name] => format!("(\"{}\",)", name),
+        names => format!(
+            "({})",
+            names.iter().map(|name| format!("\"{}\"", name)).collect::<Vec<_>>().join(", ")
+        ),
+    }
+}
+
+// Writes the fields of flattened values directly into the parent's `result`
+fn flatten_encoders(owner: &str, flattened: &[(String, Type)]) -> String {
+    let mut out = String::new();
+    for (name, ty) in flattened {
+        let encode = format!(
+            "_ts_rs_strict.load(\"{}\")._serialize_into(self.{}, result)",
+            flatten_marker(owner, name),
+            name
+        );
+        if is_option_type(ty) {
+            out.push_str(&format!("        if self.{} is not None:\n            {}\n", name, encode));
+        } else {
+            out.push_str(&format!("        {}\n", encode));
+        }
+    }
+    out
+}
+
+// Returns a Python expression interning the strings within `var`, a value of type `ty`, or `None`
+// if the type contains no strings. Unless `checked`, values of unexpected types are kept as-is.
+fn intern_expr(ty: &Type, var: &str, depth: usize, checked: bool) -> Option<String> {
+    let guard = |expr: String, py_type: &str| match checked {
+        true => expr,
+        false => format!("({} if type({}) is {} else {})", expr, var, py_type, var),
+    };
+    match ty {
+        Type::Reference(r) => intern_expr(&r.elem, var, depth, checked),
+        Type::Paren(p) => intern_expr(&p.elem, var, depth, checked),
+        Type::Group(g) => intern_expr(&g.elem, var, depth, checked),
+        Type::Slice(syn::TypeSlice { elem, .. }) | Type::Array(syn::TypeArray { elem, .. }) => {
+            let item = format!("item{}", depth);
+            let inner = intern_expr(elem, &item, depth + 1, checked)?;
+            Some(guard(format!("[{} for {} in {}]", inner, item, var), "list"))
+        }
+        Type::Path(p) if p.qself.is_none() => {
+            let segment = p.path.segments.last()?;
+            let args = type_args(segment);
+            match segment.ident.to_string().as_str() {
+                "String" | "str" | "char" => Some(guard(format!("_ts_rs_intern.intern({})", var), "str")),
+                "Box" | "Arc" | "Rc" | "Cow" => intern_expr(args.last()?, var, depth, checked),
+                "Option" => {
+                    let inner = intern_expr(args.first()?, var, depth, checked)?;
+                    Some(format!("(None if {} is None else {})", var, inner))
+                }
+                "Vec" | "VecDeque" | "HashSet" | "BTreeSet" => {
+                    let item = format!("item{}", depth);
+                    let inner = intern_expr(args.first()?, &item, depth + 1, checked)?;
+                    Some(guard(format!("[{} for {} in {}]", inner, item, var), "list"))
+                }
+                "HashMap" | "BTreeMap" | "IndexMap" => {
+                    let (key, item) = (format!("key{}", depth), format!("item{}", depth));
+                    let key_expr = intern_expr(args.first()?, &key, depth + 1, checked);
+                    let item_expr = intern_expr(args.get(1)?, &item, depth + 1, checked);
+                    if key_expr.is_none() && item_expr.is_none() {
+                        return None;
+                    }
+                    let expr = format!(
+                        "{{{}: {} for {}, {} in {}.items()}}",
+                        key_expr.unwrap_or_else(|| key.clone()),
+                        item_expr.unwrap_or_else(|| item.clone()),
+                        key,
+                        item,
+                        var
+                    );
+                    Some(guard(expr, "dict"))
+                }
+                _ => None,
+            }
+        }
+        _ => None,
+    }
+}
+
+// Interns the strings of `#[py(intern)]` fields after they have been decoded into `kwargs`
+fn intern_decoders(fields: &[PyField]) -> String {
+    let mut out = String::new();
+    for field in fields.iter().filter(|field| field.intern) {
+        let ty = match &field.ty {
+            Type::Path(p) if is_option_type(&field.ty) => {
+                type_args(p.path.segments.last().unwrap())[0].clone()
+            }
+            ty => ty.clone(),
+        };
+        // Checked by `PyField::new`
+        let interned = intern_expr(&ty, "value", 0, false).unwrap();
+        out.push_str(&format!(
+            "        value = kwargs.get(\"{}\")\n        if value is not None:\n            kwargs[\"{}\"] = {}\n",
+            field.name, field.name, interned
+        ));
+    }
+    out
+}
+
+// Serde accepts a missing key for an `Option` field, so does the lenient decoder
+fn optional_defaults(fields: &[PyField]) -> String {
+    fields
+        .iter()
+        .filter(|field| !field.flatten && is_option_type(&field.ty))
+        .map(|field| format!("        kwargs.setdefault(\"{}\", None)\n", field.name))
+        .collect()
+}
+
+// Loop of the lenient `fromDict` decoders over the fields present in `data`. Values are converted
+// the way the strict decoders convert them, but without checking them.
+const LENIENT_FIELDS_DECODER: &str = "        for key, field_type in _ts_rs_strict.field_types(cls):
+            if key in data:
+                kwargs[key] = _ts_rs_strict.lenient(field_type, data[key])
+";
+
+// Decodes flattened values from the parent's `data`, without copying it
+fn flatten_decoders(owner: &str, flattened: &[(String, Type)]) -> String {
+    let mut out = String::new();
+    for (name, ty) in flattened {
+        let decode = format!(
+            "kwargs[\"{}\"] = _ts_rs_strict.load(\"{}\").fromDict(data)",
+            name,
+            flatten_marker(owner, name)
+        );
+        if is_option_type(ty) {
+            out.push_str(&format!(
+                "        try:\n            {}\n        except (KeyError, TypeError, ValueError):\n            kwargs[\"{}\"] = None\n",
+                decode, name
+            ));
+        } else {
+            out.push_str(&format!("        {}\n", decode));
+        }
+    }
+    out
+}
+
 // Helper function to check if a type is a primitive type (Rust)
 fn is_primitive_type(type_name: &str) -> bool {
     matches!(type_name,
@@ -491,6 +744,15 @@ fn py_struct_def(s: &syn::ItemStruct) -> Result<DerivedPy> {
     imports.push("".to_string());
 
     let mut field_annotations_vec = Vec::new();
+    let mut columns = Vec::new();
+    let mut field_keys = Vec::new();
+    let mut py_fields = Vec::new();
+    let mut flattened = Vec::new();
+    let generic_names = s
+        .generics
+        .type_params()
+        .map(|p| p.ident.to_string())
+        .collect::<HashSet<_>>();
     // We no longer need to track serialization and deserialization parts separately
     // since we generate the code directly in the template
     
@@ -508,6 +770,20 @@ fn py_struct_def(s: &syn::ItemStruct) -> Result<DerivedPy> {
 
                     field_annotations_vec.push(format!("    {}: {}", field_name_str, py_type_str));
                     dependencies.append_from(&rust_type);
+                    let py_field = PyField::new(field_name_str.clone(), f)?;
+                    if py_field.flatten {
+                        flattened.push((field_name_str.clone(), rust_type.clone()));
+                    } else {
+                        field_keys.push(field_name_str.clone());
+                    }
+                    // Flattened values are merged into the row they belong to when read back
+                    let column_kind = match (py_field.flatten, is_option_type(&rust_type)) {
+                        (true, true) => quote!(format!("?flatten:{}", <#rust_type as #crate_rename::Py>::inline_flattened())),
+                        (true, false) => quote!(format!("flatten:{}", <#rust_type as #crate_rename::Py>::inline_flattened())),
+                        (false, _) => quote!(<#rust_type as #crate_rename::Py>::column_kind()),
+                    };
+                    py_fields.push(py_field);
+                    columns.push((field_name_str, column_kind));
                     
                     // We no longer collect serialization or deserialization snippets
                     // for each field - that's handled directly in the template
@@ -549,37 +825,46 @@ class {class_name}:
     def _serialize(self) -> dict:
         """Convert this dataclass to a serializable dictionary."""
         result = {{}}
-        for f in fields(self):
-            key = f.name
+        self._serialize_into(result)
+        return result
+
+    def _serialize_into(self, result: dict) -> None:
+        """Write the serialized fields of this dataclass into `result`."""
+        for key in {field_keys}:
             value = getattr(self, key)
             if value is not None:
                 if isinstance(value, Uuid):
                     # Special handling for UUIDs - convert to string
                     result[key] = str(value)
                 elif hasattr(value, '_serialize'):
-                result[key] = value._serialize()
-            elif isinstance(value, list):
+                    result[key] = value._serialize()
+                elif isinstance(value, list):
                     result[key] = [
                         str(item) if isinstance(item, Uuid) else
                         item._serialize() if hasattr(item, '_serialize') else 
                         item for item in value
                     ]
-            elif isinstance(value, dict):
+                elif isinstance(value, dict):
                     result[key] = {{
                         k: str(v) if isinstance(v, Uuid) else
                         v._serialize() if hasattr(v, '_serialize') else 
                         v for k, v in value.items()
                     }}
-            else:
-                result[key] = value
-        return result
-
+                else:
+                    result[key] = value
+{flatten_encoders}
     @classmethod
-    def fromJSON(cls, json_str: str) -> '{class_name}':
+    def fromJSON(cls, json_str: str, strict: bool = False) -> '{class_name}':
         """Deserialize JSON string to a new instance."""
         data = json.loads(json_str)
+        if strict:
+            return cls.fromDictStrict(data)
         return cls.fromDict(data)
 
+    @classmethod
+    def fromDictStrict(cls, data: dict, path: str = "$") -> '{class_name}':
+        """Create an instance from a dictionary, checking every value against the Rust type."""
+{strict_decoder}
     @classmethod
     def fromDict(cls, data: dict) -> '{class_name}':
         """Create an instance from a dictionary.
@@ -589,56 +874,42 @@ class {class_name}:
             return cls()
             
         kwargs = {{}}
-        for f in fields(cls):
-            key = f.name
-            # Check if key exists in the data dict
-            if key in data:
-                value = data.get(key)
-                # Even if value is None, we need to include it in kwargs
-                # for required parameters that accept None
-                if value is not None:
-                    # Handle UUID fields
-                    if f.type == Uuid and isinstance(value, str):
-                        kwargs[key] = Uuid(value)
-                    # Handle complex types
-                    elif hasattr(f.type, 'fromDict') and isinstance(value, dict):
-                        kwargs[key] = f.type.fromDict(value)
-                    elif isinstance(value, list) and hasattr(f.type, '__origin__') and f.type.__origin__ is list:
-                        # Handle lists
-                        element_type = getattr(f.type, '__args__', [Any])[0]
-                        if element_type == Uuid:
-                            # List of UUIDs
-                            kwargs[key] = [Uuid(item) if isinstance(item, str) else item for item in value]
-                        elif inspect.isclass(element_type) and hasattr(element_type, 'fromJSON'):
-                            # List of Enum Namespace types - use static fromJSON
-                            kwargs[key] = [element_type.fromJSON(json.dumps(item)) if isinstance(item, dict) else item 
-                                          for item in value]
-                        elif inspect.isclass(element_type) and hasattr(element_type, 'fromDict'):
-                             # List of regular Dataclasses - use fromDict
-                            kwargs[key] = [element_type.fromDict(item) if isinstance(item, dict) else item 
-                                          for item in value]
-                        else:
-                            # List of primitives or unknown
-                            kwargs[key] = value
-                    else:
-                        # Use value directly (primitives, etc.)
-                        kwargs[key] = value
-                else:
-                    # Add null/None value to kwargs
-                    kwargs[key] = None
-        
+{lenient_fields}{flatten_decoders}{optional_defaults}{intern_decoders}
         return cls(**kwargs)
 "#,
         imports = import_block,
         class_name = class_name,
-        field_annotations = field_annotations
+        field_annotations = field_annotations,
+        strict_decoder = strict_fields_decoder(&class_name, &py_fields, "cls", &generic_names),
+        lenient_fields = LENIENT_FIELDS_DECODER,
+        optional_defaults = optional_defaults(&py_fields),
+        intern_decoders = intern_decoders(&py_fields),
+        field_keys = python_tuple(&field_keys),
+        flatten_encoders = flatten_encoders(&class_name, &flattened),
+        flatten_decoders = flatten_decoders(&class_name, &flattened),
     );
 
     // Dependencies are already added during field iteration
 
     let py_name_owned = class_name.clone(); // Use the Rust ident name for py_name
     let inline_name = quote!(#py_name_owned.to_owned()); // Simple name for inline
-    let definition_code = quote!(#py_class_code.to_owned()); // Full code for definition
+    // Full code for definition, followed by the columnar schema which depends on the field types
+    // The classes of flattened fields are resolved when the bindings are exported
+    let (column_names, column_kinds): (Vec<_>, Vec<_>) = columns.into_iter().unzip();
+    let (flatten_markers, flatten_types): (Vec<_>, Vec<_>) = flattened
+        .iter()
+        .map(|(name, ty)| (flatten_marker(&class_name, name), ty))
+        .unzip();
+    let definition_code = quote! {
+        format!(
+            "{}{}",
+            #py_class_code #(.replace(#flatten_markers, &<#flatten_types as #crate_rename::Py>::inline_flattened()))*,
+            #crate_rename::py::columnar_methods(
+                #class_name,
+                &[#((#column_names, #column_kinds)),*],
+            ),
+        )
+    };
 
     Ok(DerivedPy {
         crate_rename: crate_rename.clone(),
@@ -646,7 +917,10 @@ class {class_name}:
         docs: String::new(),
         inline: inline_name, // CORRECT: Store simple name
         py_definition: definition_code, // CORRECT: Store full definition
-        inline_flattened: None, // TODO: Revisit if TypedDict can be flattened meaningfully
+        // Flattening is done by the encoders and decoders of this class
+        inline_flattened: Some(quote!(#py_name_owned.to_owned())),
+        flattened: flattened.into_iter().map(|(_, ty)| ty).collect(),
+        column_kind: None,
         dependencies,
         concrete: HashMap::new(),
         bound: None,
@@ -765,10 +1039,13 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
     
     let mut serde_tag = "type".to_string();
     let mut rename_all_rule = RenameRule::None;
+    // Only internally tagged enums write their tag and fields into the object they are in
+    let mut tagged = false;
+    let mut adjacent_or_untagged = false;
 
-    // Parse serde attributes
+    // Parse serde attributes, and the equivalent ts attributes
     for attr in &e.attrs {
-        if attr.path().is_ident("serde") {
+        if attr.path().is_ident("serde") || attr.path().is_ident("ts") {
             if let Ok(list) = attr.meta.require_list() {
                 list.parse_args_with(|input: syn::parse::ParseStream| {
                     while !input.is_empty() {
@@ -779,6 +1056,13 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
                                 let _eq: syn::Token![=] = input.parse()?;
                                 let tag_value: syn::LitStr = input.parse()?;
                                 serde_tag = tag_value.value();
+                                tagged = true;
+                            } else if ident == "content" || ident == "untagged" {
+                                adjacent_or_untagged = true;
+                                if input.peek(syn::Token![=]) {
+                                    let _eq: syn::Token![=] = input.parse()?;
+                                    let _content: syn::LitStr = input.parse()?;
+                                }
                             } else if ident == "rename_all" {
                                 let _eq: syn::Token![=] = input.parse()?;
                                 let rule_str: syn::LitStr = input.parse()?;
@@ -794,7 +1078,16 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
                                     "title_case" => RenameRule::TitleCase,
                                     _ => RenameRule::None, // Default or unknown
                                 };
+                            } else if input.peek(syn::Token![=]) {
+                                let _eq: syn::Token![=] = input.parse()?;
+                                let _value: syn::Expr = input.parse()?;
+                            } else if input.peek(syn::token::Paren) {
+                                let _content;
+                                syn::parenthesized!(_content in input);
                             }
+                        } else if !input.peek(syn::Token![,]) {
+                            // Skip anything else, e.g. the value of an attribute
+                            let _skipped: proc_macro2::TokenTree = input.parse()?;
                         }
                         // Consume comma if present
                         if input.peek(syn::Token![,]) {
@@ -870,9 +1163,19 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
     
     // Generate variant declarations for the enum
     let enum_name = e.ident.to_string();
+    let generic_names = e
+        .generics
+        .type_params()
+        .map(|p| p.ident.to_string())
+        .collect::<HashSet<_>>();
     
     // Check if we have any variants with fields
     let has_complex_variants = e.variants.iter().any(|v| !matches!(v.fields, syn::Fields::Unit));
+    let int_repr = has_int_repr(e)?;
+    if int_repr && has_complex_variants {
+        syn_err_spanned!(e; "#[py(repr = \"int\")] is only supported on enums without data");
+    }
+    let namespace = EnumNamespace::new(e, &enum_name, &serde_tag, rename_all_rule, int_repr)?;
     
     let mut generated_code = String::new();
     
@@ -899,6 +1202,7 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
     generated_code.push_str("\n\n");
     
     // Generate dataclasses for variants with fields
+    let mut flatten_markers = Vec::new();
     for variant in &e.variants {
         // Get variant name
         let variant_name = variant.ident.to_string();
@@ -911,6 +1215,18 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
         match &variant.fields {
             syn::Fields::Named(fields) => {
                 let variant_class_name = format!("{}_{}", enum_name, variant_name);
+                let py_fields = fields.named.iter()
+                    .filter_map(|f| Some((f.ident.as_ref()?.to_string(), f)))
+                    .filter(|(name, _)| !is_python_keyword(name) && !is_python_fragment(name))
+                    .map(|(name, f)| PyField::new(name, f))
+                    .collect::<Result<Vec<_>>>()?;
+                // Flattened fields are written and read by the class they are resolved to
+                let (flattened, field_keys): (Vec<_>, Vec<_>) = py_fields.iter().partition(|f| f.flatten);
+                let flattened = flattened
+                    .into_iter()
+                    .map(|f| (f.name.clone(), f.ty.clone()))
+                    .collect::<Vec<_>>();
+                let field_keys = field_keys.into_iter().map(|f| f.name.clone()).collect::<Vec<_>>();
                 let fields_defs = fields.named.iter()
                     .filter_map(|f| {
                         let field_name = f.ident.as_ref()?.to_string();
@@ -941,41 +1257,12 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
                 // Add toJSON method (uses _serialize helper)
                 dataclass_code.push_str(&generate_dataclass_to_json_method());
                 
-                // Add _serialize helper method - modified to include variant type
-                dataclass_code.push_str(&format!(r#"
-    def _serialize(self) -> dict:
-        """Convert this dataclass instance to a serializable dictionary with '{}' field."""
-        # Add the variant type based on the class name
-        variant_type = self.__class__.__name__.split('_', 1)[1] if '_' in self.__class__.__name__ else self.__class__.__name__
-        result = {{"\"{}\"": "{}"}} # Use the specified tag and apply rename rule
-        for f in fields(self):
-            key = f.name
-            value = getattr(self, key)
-            if value is not None:
-                if isinstance(value, Uuid):
-                    # Special handling for UUIDs - convert to string
-                    result[key] = str(value)
-                elif hasattr(value, '_serialize'):
-                    result[key] = value._serialize()
-                elif isinstance(value, list):
-                    result[key] = [
-                        str(item) if isinstance(item, Uuid) else
-                        item._serialize() if hasattr(item, '_serialize') else 
-                        item for item in value
-                    ]
-                elif isinstance(value, dict):
-                    result[key] = {{ # Escape braces for dict literal
-                        k: str(v) if isinstance(v, Uuid) else
-                        v._serialize() if hasattr(v, '_serialize') else 
-                        v for k, v in value.items()
-                    }}
-                else:
-                    result[key] = value
-        return result
-"#, 
-                    serde_tag, // Add serde_tag to format args
-                    serde_tag, 
-                    apply_rename_rule(&variant_name, rename_all_rule)
+                // Add _serialize helpers, writing the tag followed by the fields
+                dataclass_code.push_str(&variant_serialize_methods(
+                    &serde_tag,
+                    &apply_rename_rule(&variant_name, rename_all_rule),
+                    &python_tuple(&field_keys),
+                    &flatten_encoders(&variant_class_name, &flattened),
                 ));
 
                 // Add fromJSON class method 
@@ -984,29 +1271,38 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
                     variant_class_name
                 ));
 
-                // Add fromDict class method with proper UUID handling
+                // Add fromDict class method
                 dataclass_code.push_str(&format!(
-                    "    @classmethod\n    def fromDict(cls, data: dict) -> '{}':\n        \"\"\"Create an instance from a dictionary, handling nested types\"\"\"\n        kwargs = {{}}\n        for f in fields(cls):\n            key = f.name\n            # Check if key exists in the data dict\n            if key in data:\n                value = data.get(key)\n                # Even if value is None, we need to include it in kwargs\n                # for required parameters that accept None\n                if value is not None:\n                    # Handle UUID fields\n                    if f.type == Uuid and isinstance(value, str):\n                        kwargs[key] = Uuid(value)\n                    # Handle complex types\n                    elif hasattr(f.type, 'fromDict') and isinstance(value, dict):\n                        kwargs[key] = f.type.fromDict(value)\n                    elif isinstance(value, list) and hasattr(f.type, '__origin__') and f.type.__origin__ is list:\n                        # Handle lists\n                        element_type = getattr(f.type, '__args__', [Any])[0]\n                        if element_type == Uuid:\n                            # List of UUIDs\n                            kwargs[key] = [Uuid(item) if isinstance(item, str) else item for item in value]\n                        elif inspect.isclass(element_type) and hasattr(element_type, 'fromJSON'):
-                            # List of Enum Namespace types - use static fromJSON
-                            kwargs[key] = [element_type.fromJSON(json.dumps(item)) if isinstance(item, dict) else item 
-                                          for item in value]
-                        elif inspect.isclass(element_type) and hasattr(element_type, 'fromDict'):
-                             # List of regular Dataclasses - use fromDict
-                            kwargs[key] = [element_type.fromDict(item) if isinstance(item, dict) else item 
-                                          for item in value]
-                        else:
-                            # List of primitives or unknown
-                            kwargs[key] = value
-                    else:\n                        # Use value directly (primitives, etc.)
-                        kwargs[key] = value
-                else:\n                    # Add null/None value to kwargs\n                    kwargs[key] = None\n        \n        return cls(**kwargs)\n",
-                    variant_class_name
+                    "    @classmethod\n    def fromDict(cls, data: dict) -> '{}':\n        \"\"\"Create an instance from a dictionary, handling nested types\"\"\"\n        kwargs = {{}}\n{}{}{}{}\n        return cls(**kwargs)\n",
+                    variant_class_name,
+                    LENIENT_FIELDS_DECODER,
+                    flatten_decoders(&variant_class_name, &flattened),
+                    optional_defaults(&py_fields),
+                    intern_decoders(&py_fields),
+                ));
+
+
+                // Add strict decoder, the tag is checked by the namespace
+                dataclass_code.push_str(&format!(
+                    "\n    @classmethod\n    def fromDictStrict(cls, data: dict, path: str = \"$\") -> '{}':\n        \"\"\"Create an instance from a dictionary, checking every value against the Rust type\"\"\"\n{}",
+                    variant_class_name,
+                    strict_fields_decoder(&variant_class_name, &py_fields, "cls", &generic_names),
                 ));
                 
                 generated_code.push_str(&dataclass_code);
+                flatten_markers.extend(
+                    flattened.into_iter().map(|(name, ty)| (flatten_marker(&variant_class_name, &name), ty)),
+                );
             },
             syn::Fields::Unnamed(fields) if !fields.unnamed.is_empty() => {
                 let variant_class_name = format!("{}_{}", enum_name, variant.ident);
+                let py_fields = fields.unnamed.iter().enumerate()
+                    .map(|(i, f)| PyField::new(format!("field_{}", i), f))
+                    .collect::<Result<Vec<_>>>()?;
+                if py_fields.iter().any(|f| f.flatten) {
+                    syn_err_spanned!(fields; "flattened fields are only supported in variants with named fields");
+                }
+                let field_keys = py_fields.iter().map(|f| f.name.clone()).collect::<Vec<_>>();
                 // Generate field defs for tuple variants (field_0: Type, ...)
                 let fields_defs = fields.unnamed.iter().enumerate().map(|(i, f)| {
                     let field_name = format!("field_{}", i);
@@ -1033,41 +1329,12 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
                 // Add toJSON method (uses _serialize helper)
                 dataclass_code.push_str(&generate_dataclass_to_json_method());
                 
-                // Add _serialize helper method - modified to include variant type
-                dataclass_code.push_str(&format!(r#"
-    def _serialize(self) -> dict:
-        """Convert this dataclass instance to a serializable dictionary with '{}' field."""
-        # Add the variant type based on the class name
-        variant_type = self.__class__.__name__.split('_', 1)[1] if '_' in self.__class__.__name__ else self.__class__.__name__
-        result = {{"\"{}\"": "{}"}} # Use the specified tag and apply rename rule
-        for f in fields(self):
-            key = f.name
-            value = getattr(self, key)
-            if value is not None:
-                if isinstance(value, Uuid):
-                    # Special handling for UUIDs - convert to string
-                    result[key] = str(value)
-                elif hasattr(value, '_serialize'):
-                    result[key] = value._serialize()
-                elif isinstance(value, list):
-                    result[key] = [
-                        str(item) if isinstance(item, Uuid) else
-                        item._serialize() if hasattr(item, '_serialize') else 
-                        item for item in value
-                    ]
-                elif isinstance(value, dict):
-                    result[key] = {{ # Escape braces for dict literal
-                        k: str(v) if isinstance(v, Uuid) else
-                        v._serialize() if hasattr(v, '_serialize') else 
-                        v for k, v in value.items()
-                    }}
-                else:
-                    result[key] = value
-        return result
-"#, 
-                    serde_tag, // Add serde_tag to format args
-                    serde_tag, 
-                    apply_rename_rule(&variant_name, rename_all_rule)
+                // Add _serialize helpers, writing the tag followed by the fields
+                dataclass_code.push_str(&variant_serialize_methods(
+                    &serde_tag,
+                    &apply_rename_rule(&variant_name, rename_all_rule),
+                    &python_tuple(&field_keys),
+                    "",
                 ));
 
                 // Add fromJSON class method 
@@ -1076,23 +1343,21 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
                     variant_class_name
                 ));
 
-                // Add fromDict class method with proper UUID handling
+                // Add fromDict class method
                 dataclass_code.push_str(&format!(
-                    "    @classmethod\n    def fromDict(cls, data: dict) -> '{}':\n        \"\"\"Create an instance from a dictionary, handling nested types\"\"\"\n        kwargs = {{}}\n        for f in fields(cls):\n            key = f.name\n            # Check if key exists in the data dict\n            if key in data:\n                value = data.get(key)\n                # Even if value is None, we need to include it in kwargs\n                # for required parameters that accept None\n                if value is not None:\n                    # Handle UUID fields\n                    if f.type == Uuid and isinstance(value, str):\n                        kwargs[key] = Uuid(value)\n                    # Handle complex types\n                    elif hasattr(f.type, 'fromDict') and isinstance(value, dict):\n                        kwargs[key] = f.type.fromDict(value)\n                    elif isinstance(value, list) and hasattr(f.type, '__origin__') and f.type.__origin__ is list:\n                        # Handle lists\n                        element_type = getattr(f.type, '__args__', [Any])[0]\n                        if element_type == Uuid:\n                            # List of UUIDs\n                            kwargs[key] = [Uuid(item) if isinstance(item, str) else item for item in value]\n                        elif inspect.isclass(element_type) and hasattr(element_type, 'fromJSON'):
-                            # List of Enum Namespace types - use static fromJSON
-                            kwargs[key] = [element_type.fromJSON(json.dumps(item)) if isinstance(item, dict) else item 
-                                          for item in value]
-                        elif inspect.isclass(element_type) and hasattr(element_type, 'fromDict'):
-                             # List of regular Dataclasses - use fromDict
-                            kwargs[key] = [element_type.fromDict(item) if isinstance(item, dict) else item 
-                                          for item in value]
-                        else:
-                            # List of primitives or unknown
-                            kwargs[key] = value
-                    else:\n                        # Use value directly (primitives, etc.)
-                        kwargs[key] = value
-                else:\n                    # Add null/None value to kwargs\n                    kwargs[key] = None\n        \n        return cls(**kwargs)\n",
-                    variant_class_name
+                    "    @classmethod\n    def fromDict(cls, data: dict) -> '{}':\n        \"\"\"Create an instance from a dictionary, handling nested types\"\"\"\n        kwargs = {{}}\n{}{}{}\n        return cls(**kwargs)\n",
+                    variant_class_name,
+                    LENIENT_FIELDS_DECODER,
+                    optional_defaults(&py_fields),
+                    intern_decoders(&py_fields),
+                ));
+
+
+                // Add strict decoder, the tag is checked by the namespace
+                dataclass_code.push_str(&format!(
+                    "\n    @classmethod\n    def fromDictStrict(cls, data: dict, path: str = \"$\") -> '{}':\n        \"\"\"Create an instance from a dictionary, checking every value against the Rust type\"\"\"\n{}",
+                    variant_class_name,
+                    strict_fields_decoder(&variant_class_name, &py_fields, "cls", &generic_names),
                 ));
                 
                 generated_code.push_str(&dataclass_code);
@@ -1118,7 +1383,8 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
                 
                 match &v.fields {
                     syn::Fields::Unit => {
-                        format!("    {} = \"{}\"  # Simple variant (string constant)", variant_name, variant_name)
+                        let renamed = apply_rename_rule(&variant_name, rename_all_rule);
+                        format!("    {} = \"{}\"  # Simple variant (string constant)", variant_name, renamed)
                     },
                     syn::Fields::Named(_) | syn::Fields::Unnamed(_) => {
                         let variant_class_name = format!("{}_{}", enum_name, variant_name);
@@ -1130,50 +1396,20 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
         // Create a regular class instead of an Enum
         generated_code.push_str(&format!("class {}:\n    \"\"\"Namespace for {} variants. Access variant classes directly as attributes.\"\"\"\n{}\n", 
             enum_name, enum_name, variants_decl));
+        generated_code.push_str(&namespace.lookup_tables());
         
         // Add fromJSON static method for deserialization
         generated_code.push_str("\n    @staticmethod\n");
-        generated_code.push_str("    def fromJSON(json_str):\n");
+        generated_code.push_str("    def fromJSON(json_str, strict=False):\n");
         generated_code.push_str(&format!("        \"\"\"Deserialize JSON string using the '{}' tag to determine variant type\"\"\"\n", serde_tag));
         generated_code.push_str("        data = json.loads(json_str)\n");
+        generated_code.push_str(&format!("        if strict:\n            return {}.fromDictStrict(data)\n", enum_name));
         generated_code.push_str("        if isinstance(data, str):\n");
-        generated_code.push_str("            # Simple string variant - compare against original and renamed names\n");
-        // Generate checks for both original and renamed simple variants
-        for v in e.variants.iter().filter(|v| matches!(v.fields, syn::Fields::Unit)) {
-            let original_name = v.ident.to_string();
-            let renamed = apply_rename_rule(&original_name, rename_all_rule);
-            if original_name == renamed {
-                 generated_code.push_str(&format!("            if data == \"{}\":\n                return getattr({}, data)\n", 
-                    original_name, enum_name));
-            } else {
-                 generated_code.push_str(&format!("            if data == \"{}\" or data == \"{}\":\n                return getattr({}, \"{}\")\n", 
-                    original_name, renamed, enum_name, original_name));
-            }
-        }
-        generated_code.push_str("            return data  # Unknown string variant\n");
+        generated_code.push_str("            # Simple string variant - look up original and renamed names\n");
+        generated_code.push_str(&format!("            return {}._BY_NAME.get(data, data)\n", enum_name));
         generated_code.push_str("        elif isinstance(data, dict):\n");
-        generated_code.push_str("            # Complex variant with fields\n");
-        generated_code.push_str(&format!("            if \"{}\" in data:\n", serde_tag));
-        generated_code.push_str(&format!("                tagged_variant_name = data[\"{}\"]\n", serde_tag));
-        generated_code.push_str("                # Find the original variant name corresponding to the tagged name\n");
-        // Find the original variant name based on the potentially renamed tagged name
-        for v in e.variants.iter().filter(|v| !matches!(v.fields, syn::Fields::Unit)) {
-             let original_name = v.ident.to_string();
-             let renamed = apply_rename_rule(&original_name, rename_all_rule);
-             generated_code.push_str(&format!("                if tagged_variant_name == \"{}\":\n                    variant_name = \"{}\"\n", renamed, original_name));
-        }
-        generated_code.push_str("                else:\n                    variant_name = None # Variant name not found
-");
-        generated_code.push_str("                if variant_name is not None:\n");
-        generated_code.push_str(&format!("                    if hasattr({}, variant_name):\n", enum_name));
-        generated_code.push_str(&format!("                        variant_class = getattr({}, variant_name)\n", enum_name));
-        generated_code.push_str("                        # Check if it's a class with fromDict method\n");
-        generated_code.push_str("                        if inspect.isclass(variant_class) and hasattr(variant_class, 'fromDict'):\n");
-        generated_code.push_str(&format!("                            # Strip the tag field ('{}') before passing to fromDict\n", serde_tag));
-        generated_code.push_str(&format!("                            variant_data = {{k: v for k, v in data.items() if k != \"{}\"}}\n", serde_tag));
-        generated_code.push_str("                            return variant_class.fromDict(variant_data)\n");
-        generated_code.push_str("                        return variant_class  # Should be a simple string constant if not a dataclass
-");
+        generated_code.push_str("            # Complex variant with fields, dispatched on the tag\n");
+        generated_code.push_str(&format!("            return {}.fromDict(data)\n", enum_name));
         generated_code.push_str("        # Default fallback - return None for unknown type\n");
         generated_code.push_str("        return None\n");
         
@@ -1186,71 +1422,56 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
         generated_code.push_str("                return variant_class(**kwargs)\n");
         generated_code.push_str("            return variant_class  # Return the string constant\n");
         generated_code.push_str("        raise ValueError(f\"Unknown variant {variant_name}\")\n");
+        generated_code.push_str(&namespace.strict_decoder());
+        generated_code.push_str(&namespace.dict_methods());
         
     } else {
-        // Simple enum with just unit variants - use string constants in a namespace
-        let variants_code = e.variants.iter()
-            .filter(|v| {
-                let variant_name = v.ident.to_string();
-                // Make sure the variant name is a valid Python identifier
-                !is_python_keyword(&variant_name) && !is_python_fragment(&variant_name) && !variant_name.contains("TypedDict")
-            })
-            .map(|v| {
-                format!("    {} = \"{}\"", v.ident, v.ident)
-            }).collect::<Vec<_>>().join("\n");
+        // Simple enum with just unit variants - use string (or integer) constants in a namespace
+        let variants_code = namespace.unit_constants();
+        let constants = if int_repr { "integer constants" } else { "simple string constants" };
         
-        generated_code.push_str(&format!("class {}:\n    \"\"\"Namespace for {} variants (simple string constants)\"\"\"\n{}\n", 
-            enum_name, enum_name, variants_code));
+        generated_code.push_str(&format!("class {}:\n    \"\"\"Namespace for {} variants ({})\"\"\"\n{}\n", 
+            enum_name, enum_name, constants, variants_code));
+        generated_code.push_str(&namespace.lookup_tables());
         
         // Add fromJSON method for simple namespace
         generated_code.push_str("\n    @staticmethod\n");
-        generated_code.push_str("    def fromJSON(json_str):\n");
+        generated_code.push_str("    def fromJSON(json_str, strict=False):\n");
         generated_code.push_str(&format!("        \"\"\"Deserialize JSON string using the '{}' tag if it's a dict, otherwise compare string directly\"\"\"\n", serde_tag));
         generated_code.push_str("        data = json.loads(json_str)\n");
+        generated_code.push_str(&format!("        if strict:\n            return {}.fromDictStrict(data)\n", enum_name));
+        generated_code.push_str("        if type(data) is int:\n");
+        generated_code.push_str(&format!("            return {}._BY_VALUE.get(data, data)\n", enum_name));
         generated_code.push_str("        if isinstance(data, str):\n");
-        generated_code.push_str("            # Return the string constant if it exists (compare original and renamed)\n");
-        // Generate checks for both original and renamed simple variants
-        for v in e.variants.iter().filter(|v| matches!(v.fields, syn::Fields::Unit)) {
-            let original_name = v.ident.to_string();
-            let renamed = apply_rename_rule(&original_name, rename_all_rule);
-            if original_name == renamed {
-                 generated_code.push_str(&format!("            if data == \"{}\":\n                return getattr({}, data)\n", 
-                    original_name, enum_name));
-            } else {
-                 generated_code.push_str(&format!("            if data == \"{}\" or data == \"{}\":\n                return getattr({}, \"{}\")\n", 
-                    original_name, renamed, enum_name, original_name));
-            }
-        }
-        generated_code.push_str("            return data  # Unknown string value\n");
+        generated_code.push_str("            # Return the constant if it exists (compare original and renamed)\n");
+        generated_code.push_str(&format!("            return {}._BY_NAME.get(data, data)\n", enum_name));
         generated_code.push_str(&format!("        elif isinstance(data, dict) and \"{}\" in data:\n", serde_tag));
-        generated_code.push_str(&format!("            variant_name_tagged = data[\"{}\"]\n", serde_tag));
-        generated_code.push_str("            # Check if tagged name matches any variant (original or renamed)\n");
-        // Generate checks for both original and renamed simple variants based on tag
-        for v in e.variants.iter().filter(|v| matches!(v.fields, syn::Fields::Unit)) {
-            let original_name = v.ident.to_string();
-            let renamed = apply_rename_rule(&original_name, rename_all_rule);
-            if original_name == renamed {
-                generated_code.push_str(&format!("            if variant_name_tagged == \"{}\":\n                return getattr({}, \"{}\")\n", 
-                    renamed, enum_name, original_name));
-            } else {
-                generated_code.push_str(&format!("            if variant_name_tagged == \"{}\" or variant_name_tagged == \"{}\":\n                return getattr({}, \"{}\")\n", 
-                    original_name, renamed, enum_name, original_name));
-            }
-        }
+        generated_code.push_str(&format!("            return {}.fromDict(data)\n", enum_name));
         generated_code.push_str("        # Default fallback - return None for unknown type\n");
         generated_code.push_str("        return None\n");
+        generated_code.push_str(&namespace.strict_decoder());
+        generated_code.push_str(&namespace.dict_methods());
     }
     
-    // Also modify the dataclass serialization logic to include the variant type
-    // Find and replace in the _serialize methods
-    generated_code = generated_code.replace(
-        "    def _serialize(self) -> dict:",
-        "    def _serialize(self) -> dict:\n        \"\"\"Convert this dataclass instance to a serializable dictionary with 'type' field.\"\"\"\n        # Add the variant type based on the class name\n        variant_type = self.__class__.__name__.split('_', 1)[1] if '_' in self.__class__.__name__ else self.__class__.__name__\n        result = {\"type\": variant_type}"
-    );
-    
+    // Enums without data are stored as indices into their serialized names in columnar files, or
+    // as their discriminants if those are their members
+    let column_kind = (!has_complex_variants).then(|| {
+        if int_repr {
+            return "i64".to_owned();
+        }
+        let variants = namespace.units.iter()
+            .map(|unit| unit.renamed.as_str())
+            .collect::<Vec<_>>();
+        format!("enum:{}", variants.join(","))
+    });
+
     let py_name_owned = enum_name.clone();
     let inline_name = quote!(#py_name_owned.to_owned());
-    let definition_code = quote!(#generated_code.to_owned());
+    // The classes of flattened fields of variants are resolved when the bindings are exported
+    let (flatten_markers, flattened): (Vec<_>, Vec<_>) = flatten_markers.into_iter().unzip();
+    let definition_code = quote! {
+        #generated_code.to_owned() #(.replace(#flatten_markers, &<#flattened as #crate_rename::Py>::inline_flattened()))*
+    };
     
     Ok(DerivedPy {
         crate_rename: crate_rename.clone(),
@@ -1258,7 +1479,12 @@ fn py_enum_def(e: &syn::ItemEnum) -> Result<DerivedPy> {
         docs: String::new(),
         inline: inline_name,
         py_definition: definition_code,
-        inline_flattened: None,
+        // The tag and fields of internally tagged enums are flattened into the parent. Externally
+        // tagged, adjacently tagged and untagged enums are not supported.
+        inline_flattened: (tagged && !adjacent_or_untagged && !int_repr)
+            .then(|| quote!(#py_name_owned.to_owned())),
+        flattened,
+        column_kind,
         dependencies,
         concrete: HashMap::new(),
         bound: None,
@@ -1301,4 +1527,658 @@ fn is_python_keyword(s: &str) -> bool {
     ];
     
     keywords.contains(&s)
-}
\ No newline at end of file
+}
+// =============================================
+// Helper functions for strict decoders
+// =============================================
+
+// Inclusive range of the Rust integer type `type_name`, as Python literals
+fn int_range(type_name: &str) -> Option<(&'static str, &'static str)> {
+    Some(match type_name {
+        "u8" => ("0", "255"),
+        "u16" => ("0", "65535"),
+        "u32" => ("0", "4294967295"),
+        "u64" | "usize" => ("0", "18446744073709551615"),
+        "u128" => ("0", "340282366920938463463374607431768211455"),
+        "i8" => ("-128", "127"),
+        "i16" => ("-32768", "32767"),
+        "i32" => ("-2147483648", "2147483647"),
+        "i64" | "isize" => ("-9223372036854775808", "9223372036854775807"),
+        "i128" => (
+            "-170141183460469231731687303715884105728",
+            "170141183460469231731687303715884105727",
+        ),
+        _ => return None,
+    })
+}
+
+// Returns the type arguments of the last segment of a type path
+fn type_args(segment: &syn::PathSegment) -> Vec<&Type> {
+    match &segment.arguments {
+        syn::PathArguments::AngleBracketed(args) => args
+            .args
+            .iter()
+            .filter_map(|arg| match arg {
+                syn::GenericArgument::Type(ty) => Some(ty),
+                _ => None,
+            })
+            .collect(),
+        _ => Vec::new(),
+    }
+}
+
+// Whether values of this type are returned unchanged by the strict decoder, so that containers of
+// it can be validated without being copied
+fn strict_passthrough(ty: &Type, generics: &HashSet<String>) -> bool {
+    match ty {
+        Type::Reference(r) => strict_passthrough(&r.elem, generics),
+        Type::Paren(p) => strict_passthrough(&p.elem, generics),
+        Type::Group(g) => strict_passthrough(&g.elem, generics),
+        Type::Array(a) => strict_passthrough(&a.elem, generics),
+        Type::Slice(s) => strict_passthrough(&s.elem, generics),
+        Type::Tuple(t) => t.elems.iter().all(|ty| strict_passthrough(ty, generics)),
+        Type::Path(p) if p.qself.is_none() => {
+            let Some(segment) = p.path.segments.last() else {
+                return true;
+            };
+            let name = segment.ident.to_string();
+            let args = type_args(segment);
+            match name.as_str() {
+                _ if generics.contains(&name) => true,
+                _ if int_range(&name).is_some() => true,
+                "f32" | "f64" | "bool" | "String" | "str" | "char" | "Value" => true,
+                "NaiveDateTime" | "NaiveDate" | "NaiveTime" | "DateTime" => true,
+                "Option" | "Vec" | "VecDeque" | "HashSet" | "BTreeSet" | "Box" | "Arc" | "Rc"
+                | "Cow" => args.last().into_iter().all(|ty| strict_passthrough(ty, generics)),
+                "HashMap" | "BTreeMap" | "IndexMap" => {
+                    args.get(1).into_iter().all(|ty| strict_passthrough(ty, generics))
+                }
+                _ => false,
+            }
+        }
+        _ => true,
+    }
+}
+
+// Emits Python statements which check `src` against the Rust type `ty` and leave the decoded value
+// in `dst`. `path` is a Python expression locating `src`, which is only evaluated when raising or
+// when decoding nested generated classes.
+#[allow(clippy::too_many_arguments)]
+fn strict_decode(
+    ty: &Type,
+    src: &str,
+    dst: &str,
+    path: &str,
+    indent: usize,
+    depth: usize,
+    generics: &HashSet<String>,
+    out: &mut Vec<String>,
+) {
+    let pad = "    ".repeat(indent);
+    let raise = |expected: &str| {
+        format!(
+            "raise _ts_rs_strict.DecodeError({}, \"expected {}\", {})",
+            path, expected, src
+        )
+    };
+    let assign = |out: &mut Vec<String>| {
+        if src != dst {
+            out.push(format!("{}{} = {}", pad, dst, src));
+        }
+    };
+
+    // Sequences: check every element, and only build a new list if elements are transformed
+    let sequence = |elem: &Type, len: Option<String>, out: &mut Vec<String>| {
+        let (index, item, items) = (
+            format!("i{}", depth),
+            format!("item{}", depth),
+            format!("items{}", depth),
+        );
+        let item_path = format!("{} + \"[\" + str({}) + \"]\"", path, index);
+        out.push(format!("{}if type({}) is not list:", pad, src));
+        out.push(format!("{}    {}", pad, raise("array")));
+        if let Some(len) = len {
+            out.push(format!("{}if len({}) != {}:", pad, src, len));
+            out.push(format!("{}    {}", pad, raise(&format!("array of length {}", len))));
+        }
+        if strict_passthrough(elem, generics) {
+            let mut checks = Vec::new();
+            strict_decode(elem, &item, &item, &item_path, indent + 1, depth + 1, generics, &mut checks);
+            if !checks.is_empty() {
+                out.push(format!("{}for {}, {} in enumerate({}):", pad, index, item, src));
+                out.extend(checks);
+            }
+            assign(out);
+        } else {
+            out.push(format!("{}{} = []", pad, items));
+            out.push(format!("{}for {}, {} in enumerate({}):", pad, index, item, src));
+            strict_decode(elem, &item, &item, &item_path, indent + 1, depth + 1, generics, out);
+            out.push(format!("{}    {}.append({})", pad, items, item));
+            out.push(format!("{}{} = {}", pad, dst, items));
+        }
+    };
+
+    match ty {
+        Type::Reference(r) => strict_decode(&r.elem, src, dst, path, indent, depth, generics, out),
+        Type::Paren(p) => strict_decode(&p.elem, src, dst, path, indent, depth, generics, out),
+        Type::Group(g) => strict_decode(&g.elem, src, dst, path, indent, depth, generics, out),
+        Type::Slice(s) => sequence(&s.elem, None, out),
+        Type::Array(a) => {
+            let len = match &a.len {
+                syn::Expr::Lit(syn::ExprLit { lit: syn::Lit::Int(len), .. }) => Some(len.base10_digits().to_owned()),
+                _ => None,
+            };
+            sequence(&a.elem, len, out)
+        }
+        Type::Tuple(t) if t.elems.is_empty() => {
+            out.push(format!("{}if {} is not None:", pad, src));
+            out.push(format!("{}    {}", pad, raise("null")));
+            assign(out);
+        }
+        Type::Tuple(t) => {
+            out.push(format!("{}if type({}) is not list or len({}) != {}:", pad, src, src, t.elems.len()));
+            out.push(format!("{}    {}", pad, raise(&format!("array of length {}", t.elems.len()))));
+            let mut items = Vec::new();
+            for (i, elem) in t.elems.iter().enumerate() {
+                let item = format!("item{}_{}", depth, i);
+                out.push(format!("{}{} = {}[{}]", pad, item, src, i));
+                let item_path = format!("{} + \"[{}]\"", path, i);
+                strict_decode(elem, &item, &item, &item_path, indent, depth + 1, generics, out);
+                items.push(item);
+            }
+            out.push(format!("{}{} = [{}]", pad, dst, items.join(", ")));
+        }
+        Type::Path(p) if p.qself.is_none() && !p.path.segments.is_empty() => {
+            let segment = p.path.segments.last().unwrap();
+            let name = segment.ident.to_string();
+            let args = type_args(segment);
+            match name.as_str() {
+                _ if generics.contains(&name) => assign(out),
+                _ if int_range(&name).is_some() => {
+                    let (min, max) = int_range(&name).unwrap();
+                    out.push(format!(
+                        "{}if type({}) is not int or not {} <= {} <= {}:",
+                        pad, src, min, src, max
+                    ));
+                    out.push(format!("{}    {}", pad, raise(&name)));
+                    assign(out);
+                }
+                "f32" | "f64" => {
+                    out.push(format!("{}if type({}) is not float and type({}) is not int:", pad, src, src));
+                    out.push(format!("{}    {}", pad, raise(&name)));
+                    assign(out);
+                }
+                "bool" => {
+                    out.push(format!("{}if type({}) is not bool:", pad, src));
+                    out.push(format!("{}    {}", pad, raise("bool")));
+                    assign(out);
+                }
+                "String" | "str" | "NaiveDateTime" | "NaiveDate" | "NaiveTime" | "DateTime" => {
+                    out.push(format!("{}if type({}) is not str:", pad, src));
+                    out.push(format!("{}    {}", pad, raise("string")));
+                    assign(out);
+                }
+                "char" => {
+                    out.push(format!("{}if type({}) is not str or len({}) != 1:", pad, src, src));
+                    out.push(format!("{}    {}", pad, raise("char")));
+                    assign(out);
+                }
+                "Uuid" => {
+                    out.push(format!("{}if type({}) is not str:", pad, src));
+                    out.push(format!("{}    {}", pad, raise("uuid")));
+                    out.push(format!("{}try:", pad));
+                    out.push(format!("{}    {} = Uuid({})", pad, dst, src));
+                    out.push(format!("{}except ValueError:", pad));
+                    out.push(format!("{}    {} from None", pad, raise("uuid")));
+                }
+                "Option" => match args.first() {
+                    Some(inner) => {
+                        out.push(format!("{}if {} is not None:", pad, src));
+                        let before = out.len();
+                        strict_decode(inner, src, dst, path, indent + 1, depth, generics, out);
+                        if out.len() == before {
+                            out.push(format!("{}    pass", pad));
+                        }
+                        if src != dst {
+                            out.push(format!("{}else:", pad));
+                            out.push(format!("{}    {} = None", pad, dst));
+                        }
+                    }
+                    None => assign(out),
+                },
+                "Vec" | "VecDeque" | "HashSet" | "BTreeSet" => match args.first() {
+                    Some(elem) => sequence(elem, None, out),
+                    None => assign(out),
+                },
+                "HashMap" | "BTreeMap" | "IndexMap" => {
+                    out.push(format!("{}if type({}) is not dict:", pad, src));
+                    out.push(format!("{}    {}", pad, raise("object")));
+                    match args.get(1) {
+                        Some(value) if !strict_passthrough(value, generics) => {
+                            let (key, item, items) = (
+                                format!("key{}", depth),
+                                format!("item{}", depth),
+                                format!("items{}", depth),
+                            );
+                            let item_path = format!("{} + \"[\" + repr({}) + \"]\"", path, key);
+                            out.push(format!("{}{} = {{}}", pad, items));
+                            out.push(format!("{}for {}, {} in {}.items():", pad, key, item, src));
+                            strict_decode(value, &item, &item, &item_path, indent + 1, depth + 1, generics, out);
+                            out.push(format!("{}    {}[{}] = {}", pad, items, key, item));
+                            out.push(format!("{}{} = {}", pad, dst, items));
+                        }
+                        Some(value) => {
+                            let (key, item) = (format!("key{}", depth), format!("item{}", depth));
+                            let item_path = format!("{} + \"[\" + repr({}) + \"]\"", path, key);
+                            let mut checks = Vec::new();
+                            strict_decode(value, &item, &item, &item_path, indent + 1, depth + 1, generics, &mut checks);
+                            if !checks.is_empty() {
+                                out.push(format!("{}for {}, {} in {}.items():", pad, key, item, src));
+                                out.extend(checks);
+                            }
+                            assign(out);
+                        }
+                        None => assign(out),
+                    }
+                }
+                "Box" | "Arc" | "Rc" | "Cow" => match args.last() {
+                    Some(inner) => strict_decode(inner, src, dst, path, indent, depth, generics, out),
+                    None => assign(out),
+                },
+                // Untyped JSON
+                "Value" => assign(out),
+                // Other generated classes decode (and validate) themselves
+                _ => out.push(format!(
+                    "{}{} = _ts_rs_strict.load(\"{}\").fromDictStrict({}, {})",
+                    pad, dst, name, src, path
+                )),
+            }
+        }
+        _ => assign(out),
+    }
+}
+
+// Generates the body of a `fromDictStrict` method of the class `owner`, decoding `fields` from
+// `data` and returning `constructor(...)` with the decoded values
+fn strict_fields_decoder(
+    owner: &str,
+    fields: &[PyField],
+    constructor: &str,
+    generics: &HashSet<String>,
+) -> String {
+    let mut out = vec![
+        "        if type(data) is not dict:".to_owned(),
+        "            raise _ts_rs_strict.DecodeError(path, \"expected object\", data)".to_owned(),
+    ];
+    let mut args = Vec::new();
+    for PyField { name, ty, flatten, intern } in fields {
+        let var = format!("f_{}", name);
+        let field_path = format!("path + \".{}\"", name);
+        if *flatten {
+            let decode = format!(
+                "{} = _ts_rs_strict.load(\"{}\").fromDictStrict(data, path)",
+                var,
+                flatten_marker(owner, name)
+            );
+            if is_option_type(ty) {
+                out.push("        try:".to_owned());
+                out.push(format!("            {}", decode));
+                out.push("        except _ts_rs_strict.DecodeError:".to_owned());
+                out.push(format!("            {} = None", var));
+            } else {
+                out.push(format!("        {}", decode));
+            }
+            args.push(var);
+            continue;
+        }
+        if is_option_type(ty) {
+            out.push(format!("        {} = data.get(\"{}\")", var, name));
+        } else {
+            out.push("        try:".to_owned());
+            out.push(format!("            {} = data[\"{}\"]", var, name));
+            out.push("        except KeyError:".to_owned());
+            out.push(format!(
+                "            raise _ts_rs_strict.DecodeError({}, \"missing field\") from None",
+                field_path
+            ));
+        }
+        strict_decode(ty, &var, &var, &field_path, 2, 0, generics, &mut out);
+        if *intern {
+            // Checked by `PyField::new`
+            let interned = intern_expr(ty, &var, 0, true).unwrap();
+            out.push(format!("        {} = {}", var, interned));
+        }
+        args.push(var);
+    }
+    out.push(format!("        return {}({})", constructor, args.join(", ")));
+    out.join("\n") + "\n"
+}
+
+// Generates `_serialize` and `_serialize_into` of a variant dataclass. The tag is written first,
+// so that flattened variants can be written straight into their parent's dictionary, followed by
+// the fields named in `field_keys` and the fields written by `flatten_encoders`.
+fn variant_serialize_methods(
+    serde_tag: &str,
+    wire_name: &str,
+    field_keys: &str,
+    flatten_encoders: &str,
+) -> String {
+    format!(r#"
+    def _serialize(self) -> dict:
+        """Convert this dataclass instance to a serializable dictionary with '{serde_tag}' field."""
+        result = {{}}
+        self._serialize_into(result)
+        return result
+
+    def _serialize_into(self, result: dict) -> None:
+        """Write the '{serde_tag}' tag and the serialized fields of this variant into `result`."""
+        result["{serde_tag}"] = "{wire_name}"
+        for key in {field_keys}:
+            value = getattr(self, key)
+            if value is not None:
+                if isinstance(value, Uuid):
+                    # Special handling for UUIDs - convert to string
+                    result[key] = str(value)
+                elif hasattr(value, '_serialize'):
+                    result[key] = value._serialize()
+                elif isinstance(value, list):
+                    result[key] = [
+                        str(item) if isinstance(item, Uuid) else
+                        item._serialize() if hasattr(item, '_serialize') else 
+                        item for item in value
+                    ]
+                elif isinstance(value, dict):
+                    result[key] = {{ # Escape braces for dict literal
+                        k: str(v) if isinstance(v, Uuid) else
+                        v._serialize() if hasattr(v, '_serialize') else 
+                        v for k, v in value.items()
+                    }}
+                else:
+                    result[key] = value
+{flatten_encoders}"#)
+}
+
+// Whether a variant is part of the generated namespace
+fn is_namespace_variant(v: &syn::Variant) -> bool {
+    let name = v.ident.to_string();
+    !is_python_keyword(&name) && !is_python_fragment(&name) && !name.contains("TypedDict")
+}
+
+// Value of an integer literal discriminant, e.g. `A = 3` or `B = -1`
+fn discriminant_value(expr: &syn::Expr) -> Option<i128> {
+    match expr {
+        syn::Expr::Lit(syn::ExprLit { lit: syn::Lit::Int(int), .. }) => int.base10_parse().ok(),
+        syn::Expr::Unary(syn::ExprUnary { op: syn::UnOp::Neg(_), expr, .. }) => {
+            discriminant_value(expr).map(|value| -value)
+        }
+        syn::Expr::Paren(paren) => discriminant_value(&paren.expr),
+        _ => None,
+    }
+}
+
+// Whether the enum is annotated with `#[py(repr = "int")]`
+fn has_int_repr(e: &syn::ItemEnum) -> Result<bool> {
+    let mut int_repr = false;
+    for attr in e.attrs.iter().filter(|attr| attr.path().is_ident("py")) {
+        let Ok(list) = attr.meta.require_list() else {
+            continue;
+        };
+        let nested = list.parse_args_with(
+            syn::punctuated::Punctuated::<syn::Meta, syn::Token![,]>::parse_terminated,
+        )?;
+        for meta in nested {
+            if let syn::Meta::NameValue(syn::MetaNameValue { path, value, .. }) = meta {
+                if !path.is_ident("repr") {
+                    continue;
+                }
+                match value {
+                    syn::Expr::Lit(syn::ExprLit { lit: syn::Lit::Str(s), .. }) if s.value() == "int" => {
+                        int_repr = true;
+                    }
+                    other => syn_err_spanned!(other; "expected `repr = \"int\"`"),
+                }
+            }
+        }
+    }
+    Ok(int_repr)
+}
+
+// A unit variant of an enum namespace
+struct UnitVariant {
+    original: String,
+    renamed: String,
+    discriminant: Option<i128>,
+}
+
+// The variants of an enum namespace, from which its lookup tables and decoders are generated
+struct EnumNamespace<'a> {
+    name: &'a str,
+    tag: &'a str,
+    units: Vec<UnitVariant>,
+    // Original and renamed names of the variants with data
+    tagged: Vec<(String, String)>,
+    // Members are the discriminants of the variants instead of their names
+    int_repr: bool,
+}
+
+impl<'a> EnumNamespace<'a> {
+    fn new(
+        e: &syn::ItemEnum,
+        name: &'a str,
+        tag: &'a str,
+        rename_all_rule: RenameRule,
+        int_repr: bool,
+    ) -> Result<Self> {
+        let mut units = Vec::new();
+        let mut tagged = Vec::new();
+        let mut next_discriminant = Some(0);
+        for v in &e.variants {
+            let discriminant = match &v.discriminant {
+                Some((_, expr)) => discriminant_value(expr),
+                None => next_discriminant,
+            };
+            next_discriminant = discriminant.map(|value| value + 1);
+            if !is_namespace_variant(v) {
+                continue;
+            }
+            let original = v.ident.to_string();
+            let renamed = apply_rename_rule(&original, rename_all_rule);
+            if !matches!(v.fields, syn::Fields::Unit) {
+                tagged.push((original, renamed));
+                continue;
+            }
+            if int_repr && discriminant.is_none() {
+                syn_err_spanned!(v; "#[py(repr = \"int\")] requires integer literal discriminants");
+            }
+            units.push(UnitVariant { original, renamed, discriminant });
+        }
+        Ok(Self { name, tag, units, tagged, int_repr })
+    }
+
+    // Python literal of the member of a unit variant, the value it is serialized as
+    fn member(&self, unit: &UnitVariant) -> String {
+        match unit.discriminant {
+            Some(discriminant) if self.int_repr => discriminant.to_string(),
+            _ => format!("\"{}\"", unit.renamed),
+        }
+    }
+
+    // Class attributes of the unit variants
+    fn unit_constants(&self) -> String {
+        self.units
+            .iter()
+            .map(|unit| format!("    {} = {}", unit.original, self.member(unit)))
+            .collect::<Vec<_>>()
+            .join("\n")
+    }
+
+    // Lookup tables from the original and renamed names (`_BY_NAME`) and, for enums without data,
+    // the discriminants (`_BY_VALUE`) of unit variants to their members, and from the tags of
+    // variants with data to their classes (`_BY_TAG`)
+    fn lookup_tables(&self) -> String {
+        let mut by_name = Vec::new();
+        for unit in &self.units {
+            by_name.push(format!("\"{}\": {}", unit.original, unit.original));
+            if unit.renamed != unit.original {
+                by_name.push(format!("\"{}\": {}", unit.renamed, unit.original));
+            }
+        }
+        let mut out = format!("    _BY_NAME = {{{}}}\n", by_name.join(", "));
+        if self.tagged.is_empty() {
+            let by_value = self
+                .units
+                .iter()
+                .filter_map(|unit| Some(format!("{}: {}", unit.discriminant?, unit.original)))
+                .collect::<Vec<_>>();
+            out.push_str(&format!("    _BY_VALUE = {{{}}}\n", by_value.join(", ")));
+        } else {
+            let mut by_tag = Vec::new();
+            for (original, renamed) in &self.tagged {
+                by_tag.push(format!("\"{}\": {}", renamed, original));
+                if renamed != original {
+                    by_tag.push(format!("\"{}\": {}", original, original));
+                }
+            }
+            out.push_str(&format!("    _BY_TAG = {{{}}}\n", by_tag.join(", ")));
+        }
+        out
+    }
+
+    // The `fromDictStrict` static method. Unit variants are accepted as their serialized names or
+    // tagged objects (or as their discriminant with `#[py(repr = "int")]`), all other variants are
+    // dispatched on their tag. Unlike the lookup tables, original names of renamed variants are
+    // rejected.
+    fn strict_decoder(&self) -> String {
+        let (name, tag) = (self.name, self.tag);
+        let mut out = vec![
+            String::new(),
+            "    @staticmethod".to_owned(),
+            "    def fromDictStrict(data, path=\"$\"):".to_owned(),
+            format!(
+                "        \"\"\"Decode a variant, raising `_ts_rs_strict.DecodeError` unless `data` is a valid {}\"\"\"",
+                name
+            ),
+        ];
+        if self.int_repr {
+            out.extend([
+                "        if type(data) is not int:".to_owned(),
+                "            raise _ts_rs_strict.DecodeError(path, \"expected integer\", data)".to_owned(),
+                format!("        value = {}._BY_VALUE.get(data)", name),
+                "        if value is None:".to_owned(),
+                "            raise _ts_rs_strict.DecodeError(path, \"unknown variant \" + repr(data))".to_owned(),
+                "        return value".to_owned(),
+            ]);
+            return out.join("\n") + "\n";
+        }
+        out.extend([
+            "        if type(data) is str:".to_owned(),
+            format!("            value = {}._BY_NAME.get(data)", name),
+            "            if value != data:".to_owned(),
+            "                raise _ts_rs_strict.DecodeError(path, \"unknown variant \" + repr(data))".to_owned(),
+            "            return value".to_owned(),
+            "        if type(data) is not dict:".to_owned(),
+            "            raise _ts_rs_strict.DecodeError(path, \"expected string or object\", data)".to_owned(),
+            format!("        tag = data.get(\"{}\")", tag),
+            "        if type(tag) is str:".to_owned(),
+        ]);
+        if !self.tagged.is_empty() {
+            // `_BY_TAG` also accepts the original names of renamed variants, which serde rejects
+            let original_tags = self
+                .tagged
+                .iter()
+                .filter(|(original, _)| self.tagged.iter().all(|(_, renamed)| renamed != original))
+                .map(|(original, _)| format!("\"{}\", ", original))
+                .collect::<String>();
+            let condition = if original_tags.is_empty() {
+                "variant is not None".to_owned()
+            } else {
+                format!("variant is not None and tag not in ({})", original_tags.trim_end())
+            };
+            out.extend([
+                format!("            variant = {}._BY_TAG.get(tag)", name),
+                format!("            if {}:", condition),
+                "                return variant.fromDictStrict(data, path)".to_owned(),
+            ]);
+        }
+        out.extend([
+            format!("            value = {}._BY_NAME.get(tag)", name),
+            "            if value == tag:".to_owned(),
+            "                return value".to_owned(),
+            format!(
+                "            raise _ts_rs_strict.DecodeError(path + \".{}\", \"unknown variant \" + repr(tag))",
+                tag
+            ),
+            "        if tag is None:".to_owned(),
+            format!("            raise _ts_rs_strict.DecodeError(path + \".{}\", \"missing field\")", tag),
+            format!("        raise _ts_rs_strict.DecodeError(path + \".{}\", \"expected string\", tag)", tag),
+        ]);
+        out.join("\n") + "\n"
+    }
+
+    // The `fromDict` and `_serialize_into` static methods, also used by structs into which the enum
+    // is flattened
+    fn dict_methods(&self) -> String {
+        let (name, tag) = (self.name, self.tag);
+        let mut out = vec![
+            String::new(),
+            "    @staticmethod".to_owned(),
+            "    def fromDict(data):".to_owned(),
+            format!("        \"\"\"Decode a variant from a dictionary using the '{}' tag\"\"\"", tag),
+            format!("        tag = data.get(\"{}\")", tag),
+            "        if type(tag) is not str:".to_owned(),
+            "            return None".to_owned(),
+        ];
+        if !self.tagged.is_empty() {
+            out.extend([
+                format!("        variant = {}._BY_TAG.get(tag)", name),
+                "        if variant is not None:".to_owned(),
+                "            return variant.fromDict(data)".to_owned(),
+            ]);
+        }
+        out.extend([
+            format!("        return {}._BY_NAME.get(tag)", name),
+            String::new(),
+            "    @staticmethod".to_owned(),
+            "    def _serialize_into(value, result: dict) -> None:".to_owned(),
+            format!(
+                "        \"\"\"Write the '{}' tag and the fields of the variant `value` into `result`\"\"\"",
+                tag
+            ),
+        ]);
+        // Members are the serialized names of unit variants, unless they are their discriminants
+        let renamed_units = self
+            .units
+            .iter()
+            .filter(|_| self.int_repr)
+            .map(|unit| format!("{}: \"{}\"", self.member(unit), unit.renamed))
+            .collect::<Vec<_>>();
+        let write_unit = if renamed_units.is_empty() {
+            format!("result[\"{}\"] = value", tag)
+        } else {
+            format!("result[\"{}\"] = {{{}}}.get(value, value)", tag, renamed_units.join(", "))
+        };
+        if self.tagged.is_empty() {
+            out.push(format!("        {}", write_unit));
+        } else {
+            out.extend([
+                "        if type(value) is str:".to_owned(),
+                format!("            {}", write_unit),
+                "        else:".to_owned(),
+                "            value._serialize_into(result)".to_owned(),
+            ]);
+        }
+        out.join("\n") + "\n"
+    }
+}
+
+// Whether the type is an `Option<..>`
+fn is_option_type(ty: &Type) -> bool {
+    match ty {
+        Type::Path(p) => p
+            .path
+            .segments
+            .last()
+            .is_some_and(|segment| segment.ident == "Option"),
+        _ => false,
+    }
+}
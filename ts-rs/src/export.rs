@@ -1,12 +1,11 @@
 use std::{
     any::TypeId,
     borrow::Cow,
-    collections::{BTreeMap, BTreeSet, HashMap, HashSet},
+    collections::{btree_map::Entry, BTreeMap, BTreeSet, HashMap},
     fmt::Write,
     fs::File,
-    io::{Seek, SeekFrom},
     path::{Component, Path, PathBuf},
-    sync::{Mutex, OnceLock},
+    sync::{Arc, Mutex, OnceLock},
 };
 
 pub use error::ExportError;
@@ -18,9 +17,11 @@ use crate::TS;
 mod error;
 mod path;
 
-static EXPORT_PATHS: OnceLock<Mutex<HashMap<PathBuf, HashSet<String>>>> = OnceLock::new();
+/// Every file written during this process, together with the declarations it contains.
+/// Each file has its own lock, so that exports to different files don't block each other.
+static EXPORT_PATHS: OnceLock<Mutex<HashMap<PathBuf, Arc<Mutex<ExportedFile>>>>> = OnceLock::new();
 
-fn get_export_paths<'a>() -> &'a Mutex<HashMap<PathBuf, HashSet<String>>> {
+fn get_export_paths<'a>() -> &'a Mutex<HashMap<PathBuf, Arc<Mutex<ExportedFile>>>> {
     EXPORT_PATHS.get_or_init(|| Default::default())
 }
 
@@ -29,21 +30,25 @@ const NOTE: &str = "// This file was generated by [ts-rs](https://github.com/Ale
 mod recursive_export {
     use std::{any::TypeId, collections::HashSet, path::Path};
 
-    use super::export_into;
+    use super::{path, ExportBatch};
     use crate::{ExportError, TypeVisitor, TS};
 
     /// Exports `T` to the file specified by the `#[ts(export_to = ..)]` attribute within the given
     /// base directory.  
     /// Additionally, all dependencies of `T` will be exported as well.
+    /// Declarations are collected first, so that every file is only written once.
     pub(crate) fn export_all_into<T: TS + ?Sized + 'static>(
         out_dir: impl AsRef<Path>,
     ) -> Result<(), ExportError> {
         let mut seen = HashSet::new();
-        export_recursive::<T>(&mut seen, out_dir)
+        let mut batch = ExportBatch::default();
+        export_recursive::<T>(&mut seen, &mut batch, out_dir)?;
+        batch.flush()
     }
 
     struct Visit<'a> {
         seen: &'a mut HashSet<TypeId>,
+        batch: &'a mut ExportBatch,
         out_dir: &'a Path,
         error: Option<ExportError>,
     }
@@ -56,13 +61,14 @@ mod recursive_export {
                 return;
             }
 
-            self.error = export_recursive::<T>(self.seen, self.out_dir).err();
+            self.error = export_recursive::<T>(self.seen, self.batch, self.out_dir).err();
         }
     }
 
-    // exports T, then recursively calls itself with all of its dependencies
+    // collects T, then recursively calls itself with all of its dependencies
     fn export_recursive<T: TS + ?Sized + 'static>(
         seen: &mut HashSet<TypeId>,
+        batch: &mut ExportBatch,
         out_dir: impl AsRef<Path>,
     ) -> Result<(), ExportError> {
         if !seen.insert(TypeId::of::<T>()) {
@@ -70,10 +76,14 @@ mod recursive_export {
         }
         let out_dir = out_dir.as_ref();
 
-        export_into::<T>(out_dir)?;
+        let path = <T as crate::TS>::output_path()
+            .ok_or_else(std::any::type_name::<T>)
+            .map_err(ExportError::CannotBeExported)?;
+        batch.push::<T>(path::absolute(out_dir.join(path))?)?;
 
         let mut visitor = Visit {
             seen,
+            batch,
             out_dir,
             error: None,
         };
@@ -87,176 +97,167 @@ mod recursive_export {
     }
 }
 
-/// Export `T` to the file specified by the `#[ts(export_to = ..)]` attribute
-pub(crate) fn export_into<T: TS + ?Sized + 'static>(
-    out_dir: impl AsRef<Path>,
-) -> Result<(), ExportError> {
-    let path = <T as crate::TS>::output_path()
-        .ok_or_else(std::any::type_name::<T>)
-        .map_err(ExportError::CannotBeExported)?;
-    let path = out_dir.as_ref().join(path);
-
-    export_to::<T, _>(path::absolute(path)?)
-}
-
 /// Export `T` to the file specified by the `path` argument.
 pub(crate) fn export_to<T: TS + ?Sized + 'static, P: AsRef<Path>>(
     path: P,
 ) -> Result<(), ExportError> {
-    let path = path.as_ref().to_owned();
-    let type_name = <T as crate::TS>::ident();
+    let mut batch = ExportBatch::default();
+    batch.push::<T>(path.as_ref().to_owned())?;
+    batch.flush()
+}
 
-    #[allow(unused_mut)]
-    let mut buffer = export_to_string::<T>()?;
+/// A single exported type: the imports it requires and its declaration.
+struct Declaration {
+    imports: Vec<String>,
+    decl: String,
+}
 
-    // format output
-    #[cfg(feature = "format")]
-    {
-        use dprint_plugin_typescript::{configuration::ConfigurationBuilder, format_text};
+impl Declaration {
+    /// Formats the declaration once, so that rendering a file only concatenates declarations.
+    #[allow(unused_variables, unused_mut)]
+    fn new(path: &Path, imports: Vec<String>, mut decl: String) -> Result<Self, ExportError> {
+        #[cfg(test)]
+        tests::DECLARATIONS.fetch_add(1, std::sync::atomic::Ordering::Relaxed);
 
-        let fmt_cfg = ConfigurationBuilder::new().deno().build();
-        if let Some(formatted) = format_text(path.as_ref(), &buffer, &fmt_cfg)
-            .map_err(|e| ExportError::Formatting(e.to_string()))?
+        // format output
+        #[cfg(feature = "format")]
         {
-            buffer = formatted;
+            use dprint_plugin_typescript::{configuration::ConfigurationBuilder, format_text};
+
+            let fmt_cfg = ConfigurationBuilder::new().deno().build();
+            if let Some(formatted) = format_text(path, &decl, &fmt_cfg)
+                .map_err(|e| ExportError::Formatting(e.to_string()))?
+            {
+                decl = formatted.trim_end().to_owned();
+            }
         }
-    }
 
-    if let Some(parent) = path.parent() {
-        std::fs::create_dir_all(parent)?;
+        Ok(Self { imports, decl })
     }
-
-    export_and_merge(path, type_name, buffer)?;
-
-    Ok(())
 }
 
-/// Exports the type to a new file if the file hasn't yet been written to.
-/// Otherwise, finds its place in the already existing file and inserts it.
-fn export_and_merge(
-    path: PathBuf,
-    type_name: String,
-    generated_type: String,
-) -> Result<(), ExportError> {
-    use std::io::{Read, Write};
-
-    let lock = &mut get_export_paths().lock().unwrap();
-
-    let Some(entry) = lock.get_mut(&path) else {
-        // The file hasn't been written to yet, so it must be
-        // overwritten
-        let mut file = File::create(&path)?;
-        file.write_all(generated_type.as_bytes())?;
-        file.sync_all()?;
-
-        let mut set = HashSet::new();
-        set.insert(type_name);
-        lock.insert(path, set);
+/// The declarations of a file, ordered by type name.
+#[derive(Default)]
+struct ExportedFile {
+    decls: BTreeMap<String, Declaration>,
+}
 
-        return Ok(());
-    };
+impl ExportedFile {
+    /// Renders the file: the note, the deduplicated imports of all declarations and then every
+    /// declaration, separated by empty lines.
+    fn render(&self) -> String {
+        let imports = self
+            .decls
+            .values()
+            .flat_map(|x| &x.imports)
+            .collect::<BTreeSet<_>>();
+
+        let capacity = NOTE.len()
+            + imports.iter().map(|x| x.len() + 1).sum::<usize>()
+            + self.decls.values().map(|x| x.decl.len() + 2).sum::<usize>();
+        let mut buffer = String::with_capacity(capacity);
+
+        buffer.push_str(NOTE);
+        for import in imports {
+            buffer.push_str(import);
+            buffer.push('\n');
+        }
+        for Declaration { decl, .. } in self.decls.values() {
+            buffer.push('\n');
+            buffer.push_str(decl);
+            buffer.push('\n');
+        }
 
-    if entry.contains(&type_name) {
-        return Ok(());
+        buffer
     }
-
-    let mut file = std::fs::OpenOptions::new()
-        .read(true)
-        .write(true)
-        .open(&path)?;
-
-    let file_len = file.metadata()?.len();
-
-    let mut original_contents = String::with_capacity(file_len as usize);
-    file.read_to_string(&mut original_contents)?;
-
-    let buffer = merge(original_contents, generated_type);
-
-    file.seek(SeekFrom::Start(NOTE.len() as u64))?;
-
-    file.write_all(buffer.as_bytes())?;
-    file.sync_all()?;
-
-    entry.insert(type_name);
-
-    Ok(())
 }
 
-const HEADER_ERROR_MESSAGE: &str = "The generated strings must have their NOTE and imports separated from their type declarations by a new line";
-
-const DECLARATION_START: &str = "export type ";
-
-/// Inserts the imports and declaration from the newly generated type
-/// into the contents of the file, removimg duplicate imports and organazing
-/// both imports and declarations alphabetically
-fn merge(original_contents: String, new_contents: String) -> String {
-    let (original_header, original_decls) = original_contents
-        .split_once("\n\n")
-        .expect(HEADER_ERROR_MESSAGE);
-    let (new_header, new_decl) = new_contents.split_once("\n\n").expect(HEADER_ERROR_MESSAGE);
-
-    let imports = original_header
-        .lines()
-        .skip(1)
-        .chain(new_header.lines().skip(1))
-        .collect::<BTreeSet<_>>();
-
-    let import_len = imports.iter().map(|&x| x.len()).sum::<usize>() + imports.len();
-    let capacity = import_len + original_decls.len() + new_decl.len() + 2;
+/// Declarations collected during an export, grouped by the file they will be written to.
+#[derive(Default)]
+struct ExportBatch {
+    files: HashMap<PathBuf, ExportedFile>,
+}
 
-    let mut buffer = String::with_capacity(capacity);
+impl ExportBatch {
+    /// Adds the declaration of `T` to the file at `path`, unless it has already been added to it
+    /// by this batch or by an earlier export during this process.
+    fn push<T: TS + ?Sized + 'static>(&mut self, path: PathBuf) -> Result<(), ExportError> {
+        let type_name = <T as crate::TS>::ident();
+        let in_batch = self
+            .files
+            .get(&path)
+            .is_some_and(|file| file.decls.contains_key(&type_name));
+        if in_batch || is_exported(&path, &type_name) {
+            return Ok(());
+        }
 
-    for import in imports {
-        buffer.push_str(import);
-        buffer.push('\n')
+        let mut header = String::new();
+        generate_imports::<<T as crate::TS>::WithoutGenerics>(&mut header, default_out_dir())?;
+        let mut decl = String::new();
+        generate_decl::<T>(&mut decl);
+
+        let imports = header
+            .lines()
+            .filter(|x| !x.is_empty())
+            .map(ToOwned::to_owned)
+            .collect();
+        let declaration = Declaration::new(&path, imports, decl)?;
+
+        self.files
+            .entry(path)
+            .or_default()
+            .decls
+            .insert(type_name, declaration);
+
+        Ok(())
     }
 
-    let new_decl = new_decl.trim_matches('\n');
-
-    let new_decl_name = new_decl
-        .split(DECLARATION_START)
-        .last()
-        .unwrap()
-        .split_whitespace()
-        .next()
-        .unwrap();
-
-    let original_decls = original_decls.split("\n\n").map(|x| x.trim_matches('\n'));
-
-    let mut inserted = false;
-    for decl in original_decls {
-        let decl_name = decl
-            .split(DECLARATION_START)
-            .last()
-            .unwrap()
-            .split_whitespace()
-            .next()
-            .unwrap();
-
-        if inserted || decl_name < new_decl_name {
-            buffer.push('\n');
-            buffer.push_str(decl);
-            buffer.push('\n');
-        } else {
-            buffer.push('\n');
-            buffer.push_str(new_decl);
-            buffer.push('\n');
+    /// Writes every file of this batch exactly once.  
+    /// The first time a file is written to during this process, it is overwritten. Afterwards,
+    /// new declarations are merged with the ones which have already been written to it, so a file
+    /// shared by types exported one at a time is rewritten (from memory) once per type.
+    fn flush(self) -> Result<(), ExportError> {
+        for (path, batch) in self.files {
+            let file = get_export_paths()
+                .lock()
+                .unwrap()
+                .entry(path.clone())
+                .or_default()
+                .clone();
+            let mut file = file.lock().unwrap();
+
+            let mut changed = file.decls.is_empty();
+            for (type_name, declaration) in batch.decls {
+                if let Entry::Vacant(entry) = file.decls.entry(type_name) {
+                    entry.insert(declaration);
+                    changed = true;
+                }
+            }
+            if !changed {
+                continue;
+            }
 
-            buffer.push('\n');
-            buffer.push_str(decl);
-            buffer.push('\n');
+            if let Some(parent) = path.parent() {
+                std::fs::create_dir_all(parent)?;
+            }
+
+            #[cfg(test)]
+            tests::WRITES.fetch_add(1, std::sync::atomic::Ordering::Relaxed);
 
-            inserted = true;
+            use std::io::Write;
+            let mut out = File::create(&path)?;
+            out.write_all(file.render().as_bytes())?;
+            out.sync_all()?;
         }
-    }
 
-    if !inserted {
-        buffer.push('\n');
-        buffer.push_str(new_decl);
-        buffer.push('\n');
+        Ok(())
     }
+}
 
-    buffer
+/// Whether the declaration of `type_name` has already been written to `path` during this process.
+fn is_exported(path: &Path, type_name: &str) -> bool {
+    let file = get_export_paths().lock().unwrap().get(path).cloned();
+    file.is_some_and(|file| file.lock().unwrap().decls.contains_key(type_name))
 }
 
 /// Returns the generated definition for `T`.
@@ -356,3 +357,75 @@ fn import_path(from: &Path, import: &Path) -> Result<String, ExportError> {
         path_without_extension.to_owned()
     })
 }
+
+#[cfg(test)]
+mod tests {
+    use std::{
+        path::Path,
+        sync::atomic::{AtomicUsize, Ordering},
+    };
+
+    use crate::TS;
+
+    /// Number of declarations prepared (and formatted) by [`super::Declaration::new`].
+    pub(super) static DECLARATIONS: AtomicUsize = AtomicUsize::new(0);
+    /// Number of files written by [`super::ExportBatch::flush`].
+    pub(super) static WRITES: AtomicUsize = AtomicUsize::new(0);
+
+    macro_rules! shared_file_type {
+        ($($name:ident),*) => {$(
+            struct $name;
+
+            impl TS for $name {
+                type WithoutGenerics = Self;
+                type OptionInnerType = Self;
+
+                fn name() -> String {
+                    stringify!($name).to_owned()
+                }
+
+                fn inline() -> String {
+                    "number".to_owned()
+                }
+
+                fn inline_flattened() -> String {
+                    panic!("{} cannot be flattened", Self::name())
+                }
+
+                fn decl() -> String {
+                    format!("type {} = number;", Self::name())
+                }
+
+                fn decl_concrete() -> String {
+                    Self::decl()
+                }
+
+                fn output_path() -> Option<&'static Path> {
+                    Some(Path::new("shared.ts"))
+                }
+            }
+        )*};
+    }
+
+    shared_file_type!(A, B, C);
+
+    // `#[ts(export)]` generates one test per type, each exporting into the same file. Every export
+    // adding a declaration rewrites the file, exports of types it already contains don't.
+    #[test]
+    fn per_type_exports_prepare_each_declaration_once() {
+        let out_dir = Path::new("./bindings/export_batch");
+        A::export_all_to(out_dir).unwrap();
+        B::export_all_to(out_dir).unwrap();
+        C::export_all_to(out_dir).unwrap();
+        A::export_all_to(out_dir).unwrap();
+        B::export_all_to(out_dir).unwrap();
+
+        assert_eq!(DECLARATIONS.load(Ordering::Relaxed), 3);
+        assert_eq!(WRITES.load(Ordering::Relaxed), 3);
+
+        let content = std::fs::read_to_string(out_dir.join("shared.ts")).unwrap();
+        assert_eq!(content.matches("export type A = number;").count(), 1);
+        assert_eq!(content.matches("export type B = number;").count(), 1);
+        assert_eq!(content.matches("export type C = number;").count(), 1);
+    }
+}
@@ -117,11 +117,36 @@ impl PyDependency {
 /// | [`Py::export_all`]    | ✔️                    | `TS_RS_PY_EXPORT_DIR` |
 /// | [`Py::export_all_to`] | ✔️                    | _custom_              |
 ///
+/// ### generic types
+/// Type parameters of generic types deriving `Py` must implement `TS` as well as `Py`, e.g.
+/// `impl<T: Py + TS> Py for Page<T>`. This is the case for every type deriving both.
+///
+/// ### instrumentation
+/// Every exported class registers itself with `_ts_rs_instrument`, a runtime module written next
+/// to the bindings. Instrumentation is off by default and adds no overhead until it is enabled,
+/// either by setting `TS_RS_PY_INSTRUMENT=1` or by calling `_ts_rs_instrument.enable()`.
+/// Calls, JSON text length and cumulative time are then recorded per type and direction
+/// (encode/decode), optionally with latency histograms (`TS_RS_PY_INSTRUMENT_HISTOGRAM=1`).
+/// Results are available through `snapshot()`, `to_prometheus()` and `write_prometheus(path)`.
+///
+/// ### strict decoding
+/// Every exported class also gets a `fromDictStrict(data)` decoder, which is used by
+/// `fromJSON(s, strict=True)`. Its checks are generated from the Rust types (integer ranges,
+/// required fields, enum variants, ...) and run in the same pass as decoding. The first mismatch
+/// raises `_ts_rs_strict.DecodeError`, whose `path` locates the value, e.g. `$.items[3].id`.
+///
+/// ### enums and interning
+/// Enum namespaces carry lookup tables from variant names (`_BY_NAME`) and discriminants
+/// (`_BY_VALUE`) to their members. Enums without data annotated with `#[py(repr = "int")]` use
+/// their discriminants as members and on the wire, like `serde_repr`.
+/// Strings of fields annotated with `#[py(intern)]` are interned when decoded, either through
+/// `sys.intern` or a bounded table (`_ts_rs_intern.configure(max_size)` or `TS_RS_PY_INTERN_MAX`).
+///
 /// ### serde compatibility
 /// By default, the feature `serde-compat` is enabled.
 /// ts-rs then parses serde attributes and adjusts the generated python bindings accordingly.
 /// Not all serde attributes are supported yet - if you use an unsupported attribute, you'll see a
-/// warning.
+/// warning. Flattened enums have to be internally tagged, see [`PyFlatten`].
 pub trait Py {
     /// If this type does not have generic parameters, then `WithoutGenerics` should just be `Self`.
     /// If the type does have generic parameters, then all generic parameters must be replaced with
@@ -138,6 +163,14 @@ pub trait Py {
     #[doc(hidden)]
     const IS_OPTION: bool = false;
 
+    /// Kind of column this type is stored as in the columnar file format of generated dataclasses,
+    /// e.g. `i32`, `str`, `?f64` (nullable) or `enum:A,B`. Types without a dedicated column
+    /// layout are stored as `json`.
+    #[doc(hidden)]
+    fn column_kind() -> String {
+        "json".to_owned()
+    }
+
     /// Identifier of this type, excluding generic parameters.
     fn ident() -> String {
         // by default, fall back to `Py::name()`.
@@ -299,6 +332,36 @@ pub trait Py {
     }
 }
 
+/// Types which can be flattened into a generated dataclass with `#[serde(flatten)]`,
+/// `#[ts(flatten)]` or `#[py(flatten)]`.
+///
+/// `#[derive(Py)]` implements it for structs and for internally tagged enums, i.e. enums with
+/// `#[serde(tag = "...")]` (or `#[ts(tag = "...")]`) and without `content` or `untagged`.
+/// Flattening any other enum would write its variant under a `"type"` key serde does not use, so
+/// it is rejected at compile time:
+///
+/// ```compile_fail
+/// # use ts_rs::{Py, TS};
+/// #[derive(TS, Py)]
+/// enum Shape {
+///     Circle { radius: f64 },
+/// }
+///
+/// #[derive(TS, Py)]
+/// struct Drawing {
+///     #[py(flatten)]
+///     shape: Shape,
+/// }
+/// ```
+#[diagnostic::on_unimplemented(
+    message = "`{Self}` cannot be flattened into a Python dataclass",
+    note = "only structs and internally tagged enums (`#[serde(tag = \"...\")]` without `content` or `untagged`) can be flattened",
+    label = "flattened field of type `{Self}`"
+)]
+pub trait PyFlatten {}
+
+impl<T: PyFlatten> PyFlatten for Option<T> {}
+
 /// Default output directory for Python bindings
 fn default_py_out_dir() -> std::borrow::Cow<'static, Path> {
     match std::env::var("TS_RS_PY_EXPORT_DIR") {
@@ -526,6 +589,19 @@ fn export_to<T: Py + ?Sized + 'static, P: AsRef<Path>>(path: P) -> Result<(), Ex
     buffer.push_str("if str(_current_dir) not in sys.path:\n");
     buffer.push_str("    sys.path.append(str(_current_dir))\n\n");
     }
+
+    // Runtime support modules, exported next to the bindings by `export_runtime_modules`
+    buffer.push_str("import _ts_rs_instrument\n");
+    if definition.contains("_ts_rs_columnar.") {
+        buffer.push_str("import _ts_rs_columnar\n");
+    }
+    if definition.contains("_ts_rs_strict.") {
+        buffer.push_str("import _ts_rs_strict\n");
+    }
+    if definition.contains("_ts_rs_intern.") {
+        buffer.push_str("import _ts_rs_intern\n");
+    }
+    buffer.push('\n');
     
     // 4. TYPE_CHECKING block for custom imports
     buffer.push_str("# Forward references for type checking only\n");
@@ -586,10 +662,23 @@ fn export_to<T: Py + ?Sized + 'static, P: AsRef<Path>>(path: P) -> Result<(), Ex
          buffer.push('\n');
     }
     buffer.push_str(&final_definition_lines.join("\n"));
+
+    // 6. Register every top-level class with the (opt-in) codec instrumentation
+    let class_names = definition
+        .lines()
+        .filter_map(|line| line.strip_prefix("class "))
+        .filter_map(|rest| rest.split(['(', ':']).next())
+        .map(str::trim)
+        .filter(|name| !name.is_empty());
+    buffer.push_str("\n\n");
+    for class_name in class_names {
+        buffer.push_str(&format!("_ts_rs_instrument.register({})\n", class_name));
+    }
     
     // Ensure the directory exists
     if let Some(dir) = path.parent() {
         std::fs::create_dir_all(dir)?;
+        export_runtime_modules(dir)?;
     }
 
     // Write the final buffer to the file
@@ -597,6 +686,86 @@ fn export_to<T: Py + ?Sized + 'static, P: AsRef<Path>>(path: P) -> Result<(), Ex
     Ok(())
 }
 
+/// Generates the columnar schema of a dataclass together with its `writeColumnar` and
+/// `openColumnar` methods, given the name and [`Py::column_kind`] of every field.
+/// Flattened fields are `flatten:<Class>` columns instead, which are merged into their row.
+///
+/// The schema fingerprint stored in every file is a 64-bit FNV-1a hash of the class name and the
+/// columns, so readers reject files written for a different layout.
+#[doc(hidden)]
+pub fn columnar_methods(class_name: &str, columns: &[(&str, String)]) -> String {
+    use std::fmt::Write;
+
+    if columns.is_empty() {
+        return String::new();
+    }
+
+    let mut fingerprint: u64 = 0xcbf2_9ce4_8422_2325;
+    let schema = std::iter::once(class_name)
+        .chain(columns.iter().flat_map(|(name, kind)| [*name, kind.as_str()]));
+    for part in schema {
+        for byte in part.bytes().chain(std::iter::once(0)) {
+            fingerprint ^= u64::from(byte);
+            fingerprint = fingerprint.wrapping_mul(0x0000_0100_0000_01b3);
+        }
+    }
+
+    let mut out = String::from("\n    _COLUMNS = (\n");
+    for (name, kind) in columns {
+        let _ = writeln!(out, "        (\"{}\", \"{}\"),", name, kind);
+    }
+    let _ = write!(
+        out,
+        r#"    )
+    _COLUMNAR_FINGERPRINT = 0x{fingerprint:016x}
+
+    @classmethod
+    def writeColumnar(cls, path: str, records, chunk_rows: int = 65536) -> int:
+        """Write records to a memory-mappable columnar file, returning the number of rows."""
+        return _ts_rs_columnar.write(cls, path, records, chunk_rows)
+
+    @classmethod
+    def openColumnar(cls, path: str) -> '_ts_rs_columnar.ColumnarFile':
+        """Memory-map a columnar file written by `writeColumnar`."""
+        return _ts_rs_columnar.ColumnarFile(cls, path)
+"#
+    );
+    out
+}
+
+/// Python modules shared by all generated bindings, written next to them on export.
+const RUNTIME_MODULES: &[(&str, &str)] = &[
+    (
+        "_ts_rs_instrument.py",
+        include_str!("py/_ts_rs_instrument.py"),
+    ),
+    (
+        "_ts_rs_columnar.py",
+        include_str!("py/_ts_rs_columnar.py"),
+    ),
+    ("_ts_rs_strict.py", include_str!("py/_ts_rs_strict.py")),
+    ("_ts_rs_intern.py", include_str!("py/_ts_rs_intern.py")),
+];
+
+/// Writes the [`RUNTIME_MODULES`] into `dir`, once per directory and process.
+fn export_runtime_modules(dir: &Path) -> Result<(), ExportError> {
+    use std::{collections::HashSet, sync::Mutex};
+
+    static WRITTEN: OnceLock<Mutex<HashSet<PathBuf>>> = OnceLock::new();
+
+    let mut written = WRITTEN.get_or_init(Default::default).lock().unwrap();
+    if written.contains(dir) {
+        return Ok(());
+    }
+
+    for (file_name, contents) in RUNTIME_MODULES {
+        std::fs::write(dir.join(file_name), contents)?;
+    }
+    written.insert(dir.to_owned());
+
+    Ok(())
+}
+
 /// Export all Python types starting from a root type
 fn export_all_into<T: Py + ?Sized + 'static>(
     out_dir: impl AsRef<Path>,
@@ -715,10 +884,11 @@ fn export_to_string<T: Py + ?Sized + 'static>() -> Result<String, ExportError> {
 // ------------- Primitives ------------- 
 // Generic implementation for primitives
 macro_rules! impl_py_primitive { 
-    ($($ty:ty => $py:expr),* $(,)?) => {
+    ($($ty:ty => ($py:expr, $column:expr)),* $(,)?) => {
         $(impl Py for $ty {
             type WithoutGenerics = Self;
             type OptionInnerType = Self;
+            fn column_kind() -> String { $column.to_owned() }
             fn name() -> String { $py.to_owned() }
             fn inline() -> String { $py.to_owned() }
             fn inline_flattened() -> String { panic!("Primitive type {} cannot be flattened", Self::name()) }
@@ -730,12 +900,13 @@ macro_rules! impl_py_primitive {
 }
 
 impl_py_primitive! {
-    u8 => "int", i8 => "int", u16 => "int", i16 => "int", u32 => "int", i32 => "int", 
-    usize => "int", isize => "int", 
-    f32 => "float", f64 => "float", // Use float for f32/f64
-    u64 => "int", i64 => "int", u128 => "int", i128 => "int",
-    bool => "bool",
-    char => "str", String => "str", str => "str",
+    u8 => ("int", "u8"), i8 => ("int", "i8"), u16 => ("int", "u16"), i16 => ("int", "i16"),
+    u32 => ("int", "u32"), i32 => ("int", "i32"),
+    usize => ("int", "u64"), isize => ("int", "i64"),
+    f32 => ("float", "f32"), f64 => ("float", "f64"), // Use float for f32/f64
+    u64 => ("int", "u64"), i64 => ("int", "i64"), u128 => ("int", "json"), i128 => ("int", "json"),
+    bool => ("bool", "bool"),
+    char => ("str", "str"), String => ("str", "str"), str => ("str", "str"),
 }
 
 // ------------- Dummy Type ------------- 
@@ -917,6 +1088,13 @@ impl<T: Py> Py for Option<T> {
     type OptionInnerType = T;
     const IS_OPTION: bool = true;
 
+    fn column_kind() -> String {
+        match T::column_kind() {
+            // Nested options cannot be told apart by a single validity byte
+            kind if kind.starts_with('?') => "json".to_owned(),
+            kind => format!("?{}", kind),
+        }
+    }
     fn name() -> String {
         format!("Optional[{}]", T::name())
     }
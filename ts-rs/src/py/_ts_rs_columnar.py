@@ -0,0 +1,408 @@
+"""Memory-mapped columnar container for ts-rs generated Python dataclasses.
+
+Files are written by `<Class>.writeColumnar(path, records)` and opened with
+`<Class>.openColumnar(path)`. All integers are little-endian.
+
+Layout::
+
+    header      magic, version, column count, schema fingerprint, row count,
+                chunk count, directory offset, schema offset and length
+    chunks      per chunk and column: values, offsets and validity segments,
+                each aligned to 8 bytes
+    directory   per chunk: row count, then (offset, length) of the three
+                segments of every column
+    schema      JSON list of [name, kind] pairs
+
+Numeric columns are raw arrays, strings are u64 offsets plus a UTF-8 blob,
+unit enums are u8/u16 indices into their serialized variant names and
+everything else is stored as JSON text. Optional columns carry one validity byte per row. Flattened fields are
+stored as the JSON object their class serializes them to, which is merged into
+the row when it is read.
+
+Readers `mmap` the file read-only, so the pages are shared with every other
+process mapping the same file. Columns are exposed as zero-copy memoryviews
+and rows are only materialized (through `fromDict`) when accessed.
+`ColumnarFile` objects pickle by path, so they can be handed to worker
+processes which then map the same file.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import _ts_rs_strict
+
+MAGIC = b"TSRSCOL1"
+VERSION = 1
+DEFAULT_CHUNK_ROWS = 65536
+
+_HEADER = struct.Struct("<8sIIQQQQQQ")
+_SEGMENT = struct.Struct("<QQ")
+_ALIGN = 8
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+# kind -> (memoryview format, array typecode)
+_NUMERIC = {
+    "i8": ("b", "b"),
+    "u8": ("B", "B"),
+    "i16": ("h", "h"),
+    "u16": ("H", "H"),
+    "i32": ("i", "i"),
+    "u32": ("I", "I"),
+    "i64": ("q", "q"),
+    "u64": ("Q", "Q"),
+    "f32": ("f", "f"),
+    "f64": ("d", "d"),
+    "bool": ("?", "B"),
+}
+
+
+class _Column:
+    """Parsed schema entry of a single column."""
+
+    __slots__ = ("name", "kind", "nullable", "fmt", "typecode", "variants", "index", "flattened")
+
+    def __init__(self, name: str, kind: str) -> None:
+        self.name = name
+        self.nullable = kind.startswith("?")
+        kind = kind[1:] if self.nullable else kind
+        self.variants: Optional[Tuple[str, ...]] = None
+        self.index: Optional[Dict[str, int]] = None
+        self.flattened: Optional[str] = None
+        if kind.startswith("enum:"):
+            self.variants = tuple(kind[len("enum:"):].split(","))
+            self.index = {v: i for i, v in enumerate(self.variants)}
+            self.kind = "enum"
+            self.fmt = self.typecode = "B" if len(self.variants) <= 0xFF else "H"
+        elif kind in _NUMERIC:
+            self.kind = kind
+            self.fmt, self.typecode = _NUMERIC[kind]
+        elif kind.startswith("flatten:"):
+            self.flattened = kind[len("flatten:"):]
+            self.kind, self.fmt, self.typecode = "flatten", None, None
+        elif kind == "str":
+            self.kind, self.fmt, self.typecode = kind, None, None
+        else:
+            self.kind, self.fmt, self.typecode = "json", None, None
+
+
+_OFFSETS = _Column("offsets", "u64")
+
+
+def _columns(cls) -> List[_Column]:
+    return [_Column(name, kind) for name, kind in cls._COLUMNS]
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "_serialize"):
+        return value._serialize()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _flattened(column: _Column, value: Any) -> dict:
+    # Flattened values are written the way the class of the column writes them into its parent
+    result: dict = {}
+    _ts_rs_strict.load(column.flattened)._serialize_into(value, result)
+    return result
+
+
+def _pad(f, written: int) -> int:
+    padding = -written % _ALIGN
+    if padding:
+        f.write(b"\0" * padding)
+    return written + padding
+
+
+def _write_segment(f, offset: int, data) -> Tuple[int, Tuple[int, int]]:
+    """Writes `data` at the aligned `offset`, returning the new offset and the segment."""
+    data = memoryview(data).cast("B")
+    f.write(data)
+    return _pad(f, offset + len(data)), (offset, len(data))
+
+
+def _numeric_array(column: _Column, values: Sequence[Any]) -> array:
+    zero = 0.0 if column.kind in ("f32", "f64") else 0
+    if column.kind == "enum":
+        index = column.index
+        try:
+            data = array(column.typecode, [0 if v is None else index[v] for v in values])
+        except KeyError as e:
+            raise ValueError("unknown variant {} for column {!r}".format(e, column.name)) from None
+    else:
+        data = array(column.typecode, [zero if v is None else v for v in values])
+    if not _LITTLE_ENDIAN:
+        data.byteswap()
+    return data
+
+
+def _string_segments(column: _Column, values: Sequence[Any]) -> Tuple[bytes, array]:
+    offsets = array("Q", [0])
+    parts = []
+    position = 0
+    for value in values:
+        if value is not None:
+            if column.kind == "str":
+                text = value
+            elif column.kind == "flatten":
+                text = json.dumps(_flattened(column, value))
+            else:
+                text = json.dumps(_jsonable(value))
+            encoded = text.encode("utf-8")
+            parts.append(encoded)
+            position += len(encoded)
+        offsets.append(position)
+    if not _LITTLE_ENDIAN:
+        offsets.byteswap()
+    return b"".join(parts), offsets
+
+
+def _write_chunk(f, offset: int, columns: List[_Column], rows: List[List[Any]]) -> Tuple[int, list]:
+    segments = []
+    for column, values in zip(columns, rows):
+        empty = (offset, 0)
+        if column.fmt is not None:
+            offset, data = _write_segment(f, offset, _numeric_array(column, values))
+            offsets = empty
+        else:
+            blob, offset_array = _string_segments(column, values)
+            offset, data = _write_segment(f, offset, blob)
+            offset, offsets = _write_segment(f, offset, offset_array)
+        if column.nullable:
+            validity = bytes(0 if v is None else 1 for v in values)
+            offset, valid = _write_segment(f, offset, validity)
+        else:
+            valid = empty
+        segments.append((data, offsets, valid))
+    return offset, segments
+
+
+def write(cls, path: str, records: Iterable[Any], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """Writes `records` (instances of `cls`) to `path`, returning the number of rows written."""
+    if chunk_rows <= 0:
+        raise ValueError("chunk_rows must be positive")
+    columns = _columns(cls)
+    names = [column.name for column in columns]
+    directory = []
+    total_rows = 0
+
+    with open(path, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        offset = _pad(f, _HEADER.size)
+
+        buffered: List[List[Any]] = [[] for _ in columns]
+        pending = 0
+
+        def flush() -> None:
+            nonlocal offset, buffered, pending
+            offset, segments = _write_chunk(f, offset, columns, buffered)
+            directory.append((pending, segments))
+            buffered = [[] for _ in columns]
+            pending = 0
+
+        for record in records:
+            for values, name in zip(buffered, names):
+                values.append(getattr(record, name))
+            pending += 1
+            total_rows += 1
+            if pending == chunk_rows:
+                flush()
+        if pending:
+            flush()
+
+        directory_offset = offset
+        for rows, segments in directory:
+            f.write(struct.pack("<Q", rows))
+            for column_segments in segments:
+                for segment in column_segments:
+                    f.write(_SEGMENT.pack(*segment))
+        schema = json.dumps([list(entry) for entry in cls._COLUMNS]).encode("utf-8")
+        schema_offset = f.tell()
+        f.write(schema)
+
+        f.seek(0)
+        f.write(_HEADER.pack(
+            MAGIC, VERSION, len(columns), cls._COLUMNAR_FINGERPRINT, total_rows,
+            len(directory), directory_offset, schema_offset, len(schema),
+        ))
+
+    return total_rows
+
+
+def _numeric_view(buffer: memoryview, column: _Column):
+    if _LITTLE_ENDIAN:
+        return buffer.cast(column.fmt)
+    data = array(column.typecode)
+    data.frombytes(buffer)
+    data.byteswap()
+    return data
+
+
+class StringColumn:
+    """Zero-copy view of a string or JSON column within one chunk."""
+
+    __slots__ = ("offsets", "data", "_json")
+
+    def __init__(self, offsets, data: memoryview, is_json: bool) -> None:
+        self.offsets = offsets
+        self.data = data
+        self._json = is_json
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def raw(self, i: int) -> memoryview:
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+
+    def __getitem__(self, i: int) -> Any:
+        text = str(self.raw(i), "utf-8")
+        return json.loads(text) if self._json else text
+
+
+class Chunk:
+    """One chunk of a columnar file. Columns are zero-copy views into the mapping."""
+
+    def __init__(self, owner: "ColumnarFile", start: int, rows: int, segments: list) -> None:
+        self.start = start
+        self.rows = rows
+        self._owner = owner
+        self._segments = segments
+
+    def _segment(self, segment: Tuple[int, int]) -> memoryview:
+        offset, length = segment
+        return self._owner._view[offset:offset + length]
+
+    def column(self, name: str):
+        """Returns the values of `name` as a memoryview (numeric and enum columns) or `StringColumn`."""
+        i = self._owner._index[name]
+        column = self._owner._columns[i]
+        data, offsets, _ = self._segments[i]
+        if column.fmt is not None:
+            return _numeric_view(self._segment(data), column)
+        offset_view = _numeric_view(self._segment(offsets), _OFFSETS)
+        return StringColumn(offset_view, self._segment(data), column.kind != "str")
+
+    def validity(self, name: str) -> Optional[memoryview]:
+        """Returns one byte per row (1 = present) for optional columns, `None` otherwise."""
+        i = self._owner._index[name]
+        if not self._owner._columns[i].nullable:
+            return None
+        return self._segment(self._segments[i][2])
+
+    def value(self, name: str, row: int) -> Any:
+        """Returns the JSON-equivalent value of `name` in `row`, relative to this chunk."""
+        column = self._owner._columns[self._owner._index[name]]
+        valid = self.validity(name)
+        if valid is not None and not valid[row]:
+            return None
+        value = self.column(name)[row]
+        if column.kind == "enum":
+            return column.variants[value]
+        if column.kind == "bool":
+            return bool(value)
+        return value
+
+
+class ColumnarFile:
+    """A read-only, memory-mapped columnar file of `cls` records."""
+
+    def __init__(self, cls, path: str) -> None:
+        self.cls = cls
+        self.path = path
+        self._columns = _columns(cls)
+        self._index = {column.name: i for i, column in enumerate(self._columns)}
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        (magic, version, n_columns, fingerprint, rows, n_chunks,
+         directory_offset, _schema_offset, _schema_length) = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError("{} is not a ts-rs columnar file".format(path))
+        if version != VERSION:
+            raise ValueError("unsupported columnar format version {}".format(version))
+        if fingerprint != cls._COLUMNAR_FINGERPRINT or n_columns != len(self._columns):
+            raise ValueError("schema of {} does not match {}".format(path, cls.__name__))
+
+        self._rows = rows
+        self.chunks: List[Chunk] = []
+        self._starts: List[int] = []
+        position = directory_offset
+        start = 0
+        for _ in range(n_chunks):
+            (chunk_rows,) = struct.unpack_from("<Q", self._view, position)
+            position += 8
+            segments = []
+            for _ in range(n_columns):
+                column_segments = []
+                for _ in range(3):
+                    column_segments.append(_SEGMENT.unpack_from(self._view, position))
+                    position += _SEGMENT.size
+                segments.append(tuple(column_segments))
+            self.chunks.append(Chunk(self, start, chunk_rows, segments))
+            self._starts.append(start)
+            start += chunk_rows
+
+    @property
+    def schema(self) -> List[Tuple[str, str]]:
+        return [tuple(entry) for entry in self.cls._COLUMNS]
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def column(self, name: str) -> list:
+        """Returns the per-chunk zero-copy views of column `name`."""
+        return [chunk.column(name) for chunk in self.chunks]
+
+    def _locate(self, row: int) -> Tuple[Chunk, int]:
+        if row < 0:
+            row += self._rows
+        if not 0 <= row < self._rows:
+            raise IndexError("row index out of range")
+        chunk = self.chunks[bisect_right(self._starts, row) - 1]
+        return chunk, row - chunk.start
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Returns `row` as the dictionary `fromDict` would receive."""
+        chunk, local = self._locate(row)
+        result = {}
+        for column in self._columns:
+            value = chunk.value(column.name, local)
+            if column.kind != "flatten":
+                result[column.name] = value
+            elif value is not None:
+                result.update(value)
+        return result
+
+    def __getitem__(self, row: int):
+        return self.cls.fromDict(self.row(row))
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self._rows):
+            yield self[i]
+
+    def close(self) -> None:
+        """Unmaps the file. All views obtained from this file must have been released."""
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "ColumnarFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __reduce__(self):
+        return (ColumnarFile, (self.cls, self.path))
@@ -0,0 +1,279 @@
+"""Opt-in hot-path instrumentation for ts-rs generated Python codecs.
+
+Every class exported by ts-rs registers itself here. Nothing is wrapped until
+instrumentation is enabled, so disabled codecs run without any overhead.
+
+Enable it by setting `TS_RS_PY_INSTRUMENT=1` before the bindings are imported,
+or by calling `enable()` at runtime. Per type and direction (encode/decode) the
+number of calls, the JSON text length and the cumulative (inclusive) wall time
+are recorded. Latency histograms are collected when
+`TS_RS_PY_INSTRUMENT_HISTOGRAM=1` is set or `enable(histogram=True)` is used.
+If `TS_RS_PY_INSTRUMENT_FILE` is set, the Prometheus text exposition is
+written to that path when the interpreter exits.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+ENCODE = "encode"
+DECODE = "decode"
+
+# Generated methods hooked per direction. `toJSON`/`fromJSON` additionally
+# account for the size of the JSON text they produce or consume.
+_METHODS = (
+    ("toJSON", ENCODE, True),
+    ("_serialize", ENCODE, False),
+    ("fromJSON", DECODE, True),
+    ("fromDict", DECODE, False),
+    ("fromDictStrict", DECODE, False),
+)
+
+DEFAULT_BUCKETS = (
+    0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005,
+    0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0,
+)
+
+_lock = threading.Lock()
+_local = threading.local()
+_registry: List[type] = []
+_originals: Dict[type, Dict[str, Any]] = {}
+_stats: Dict[tuple, "_Stat"] = {}
+_enabled = False
+_buckets: Optional[Sequence[float]] = None
+
+
+class _Stat:
+    __slots__ = ("calls", "bytes", "seconds", "counts")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.counts: Optional[List[int]] = None
+        self.configure()
+
+    def configure(self) -> None:
+        self.counts = None if _buckets is None else [0] * (len(_buckets) + 1)
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.configure()
+
+    def record(self, elapsed: float, nbytes: int) -> None:
+        with _lock:
+            self.calls += 1
+            self.bytes += nbytes
+            self.seconds += elapsed
+            if self.counts is not None:
+                self.counts[bisect_left(_buckets, elapsed)] += 1
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _stat(type_name: str, direction: str) -> _Stat:
+    key = (type_name, direction)
+    stat = _stats.get(key)
+    if stat is None:
+        stat = _stats[key] = _Stat()
+    return stat
+
+
+def _json_argument(args: tuple, kwargs: dict) -> Any:
+    """Returns the JSON text passed to `fromJSON`, which may be followed by `strict`."""
+    for arg in args:
+        if isinstance(arg, (str, bytes, bytearray)):
+            return arg
+    return kwargs.get("json_str")
+
+
+def _wrap(func, type_name: str, direction: str, measure_bytes: bool):
+    key = (type_name, direction)
+    stat = _stat(type_name, direction)
+
+    def wrapper(*args, **kwargs):
+        active = getattr(_local, "active", None)
+        if active is None:
+            active = _local.active = set()
+        # `toJSON` calls `_serialize` on the same type; only the outermost
+        # call of a type and direction is accounted for.
+        if key in active:
+            return func(*args, **kwargs)
+        active.add(key)
+        start = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            elapsed = perf_counter() - start
+            active.discard(key)
+        nbytes = 0
+        if measure_bytes:
+            payload = result if direction == ENCODE else _json_argument(args, kwargs)
+            if isinstance(payload, (str, bytes, bytearray)):
+                nbytes = len(payload)
+        stat.record(elapsed, nbytes)
+        return result
+
+    wrapper.__name__ = getattr(func, "__name__", "wrapper")
+    wrapper.__doc__ = getattr(func, "__doc__", None)
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def _instrument(cls: type) -> None:
+    if cls in _originals:
+        return
+    originals = {}
+    for name, direction, measure_bytes in _METHODS:
+        raw = cls.__dict__.get(name)
+        if raw is None:
+            continue
+        if isinstance(raw, (staticmethod, classmethod)):
+            wrapped = type(raw)(_wrap(raw.__func__, cls.__name__, direction, measure_bytes))
+        elif callable(raw):
+            wrapped = _wrap(raw, cls.__name__, direction, measure_bytes)
+        else:
+            continue
+        originals[name] = raw
+        setattr(cls, name, wrapped)
+    _originals[cls] = originals
+
+
+def _restore(cls: type) -> None:
+    for name, raw in _originals.pop(cls, {}).items():
+        setattr(cls, name, raw)
+
+
+def register(cls: type) -> type:
+    """Registers a generated class. Its codecs are only wrapped while instrumentation is enabled."""
+    _registry.append(cls)
+    if _enabled:
+        _instrument(cls)
+    return cls
+
+
+def enable(histogram: bool = False, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+    """Instruments all registered classes, optionally collecting latency histograms."""
+    global _enabled, _buckets
+    with _lock:
+        _buckets = tuple(sorted(buckets)) if histogram else None
+        for stat in _stats.values():
+            stat.configure()
+    _enabled = True
+    for cls in _registry:
+        _instrument(cls)
+
+
+def disable() -> None:
+    """Restores the original, unwrapped codecs. Collected statistics are kept."""
+    global _enabled
+    _enabled = False
+    for cls in list(_originals):
+        _restore(cls)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Clears all collected statistics."""
+    with _lock:
+        for stat in _stats.values():
+            stat.reset()
+
+
+def snapshot() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Returns the collected statistics as `{type: {direction: {...}}}`."""
+    result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    with _lock:
+        for (type_name, direction), stat in sorted(_stats.items()):
+            if stat.calls == 0:
+                continue
+            entry: Dict[str, Any] = {
+                "calls": stat.calls,
+                "bytes": stat.bytes,
+                "seconds": stat.seconds,
+            }
+            if stat.counts is not None:
+                entry["histogram"] = {
+                    "buckets": list(_buckets),
+                    "counts": list(stat.counts),
+                }
+            result.setdefault(type_name, {})[direction] = entry
+    return result
+
+
+def _labels(type_name: str, direction: str, **extra: str) -> str:
+    labels = {"type": type_name, "direction": direction, **extra}
+    escaped = (
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def to_prometheus() -> str:
+    """Returns the collected statistics in the Prometheus text exposition format."""
+    snap = snapshot()
+    lines = []
+    counters = (
+        ("calls", "ts_rs_py_codec_calls_total", "Number of generated codec calls."),
+        ("bytes", "ts_rs_py_codec_bytes_total", "Length of the JSON text encoded or decoded."),
+        ("seconds", "ts_rs_py_codec_seconds_total", "Cumulative time spent in generated codecs."),
+    )
+    for field, metric, help_text in counters:
+        lines.append("# HELP {} {}".format(metric, help_text))
+        lines.append("# TYPE {} counter".format(metric))
+        for type_name, directions in snap.items():
+            for direction, entry in directions.items():
+                lines.append("{}{} {}".format(metric, _labels(type_name, direction), entry[field]))
+
+    histograms = [
+        (type_name, direction, entry)
+        for type_name, directions in snap.items()
+        for direction, entry in directions.items()
+        if "histogram" in entry
+    ]
+    if histograms:
+        metric = "ts_rs_py_codec_duration_seconds"
+        lines.append("# HELP {} Latency of generated codec calls.".format(metric))
+        lines.append("# TYPE {} histogram".format(metric))
+        for type_name, direction, entry in histograms:
+            cumulative = 0
+            hist = entry["histogram"]
+            for bound, count in zip(hist["buckets"], hist["counts"]):
+                cumulative += count
+                labels = _labels(type_name, direction, le=repr(float(bound)))
+                lines.append("{}_bucket{} {}".format(metric, labels, cumulative))
+            labels = _labels(type_name, direction, le="+Inf")
+            lines.append("{}_bucket{} {}".format(metric, labels, entry["calls"]))
+            labels = _labels(type_name, direction)
+            lines.append("{}_sum{} {}".format(metric, labels, entry["seconds"]))
+            lines.append("{}_count{} {}".format(metric, labels, entry["calls"]))
+
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    """Atomically writes the Prometheus text exposition to `path`."""
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(to_prometheus())
+    os.replace(tmp_path, path)
+
+
+if _env_flag("TS_RS_PY_INSTRUMENT"):
+    enable(histogram=_env_flag("TS_RS_PY_INSTRUMENT_HISTOGRAM"))
+
+if os.environ.get("TS_RS_PY_INSTRUMENT_FILE"):
+    atexit.register(write_prometheus, os.environ["TS_RS_PY_INSTRUMENT_FILE"])
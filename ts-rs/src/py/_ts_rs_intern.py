@@ -0,0 +1,54 @@
+"""String interning for the decoders of fields marked with `#[py(intern)]`.
+
+Decoded strings of interned fields are passed through `intern`, so that records
+share a single copy of repeated values (tags, names, country codes, ...) and
+compare by identity first. By default this is `sys.intern`. Calling
+`configure(max_size)`, or setting `TS_RS_PY_INTERN_MAX` before the bindings are
+imported, switches to a table holding at most `max_size` distinct strings.
+Once the table is full, new strings are returned as they are, so fields with
+unexpectedly many distinct values cannot grow it without bound.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Dict, Optional
+
+_table: Dict[str, str] = {}
+_max_size: Optional[int] = None
+
+
+def _intern_bounded(value: str) -> str:
+    interned = _table.get(value)
+    if interned is not None:
+        return interned
+    if len(_table) < _max_size:
+        _table[value] = value
+    return value
+
+
+# Rebound by `configure`, generated decoders look it up on every call
+intern = sys.intern
+
+
+def configure(max_size: Optional[int] = None) -> None:
+    """Uses a table of at most `max_size` strings, or `sys.intern` if `max_size` is None."""
+    global intern, _max_size
+    _table.clear()
+    _max_size = max_size
+    intern = sys.intern if max_size is None else _intern_bounded
+
+
+def clear() -> None:
+    """Drops all strings held by the bounded table."""
+    _table.clear()
+
+
+def size() -> Optional[int]:
+    """Returns the number of strings in the bounded table, or None when using `sys.intern`."""
+    return None if _max_size is None else len(_table)
+
+
+if os.environ.get("TS_RS_PY_INTERN_MAX"):
+    configure(int(os.environ["TS_RS_PY_INTERN_MAX"]))
@@ -0,0 +1,136 @@
+"""Support code for the strict decoders (`fromDictStrict`) of ts-rs generated Python bindings.
+
+The type and shape checks themselves are generated inline from the Rust types,
+so validation happens in the same pass as decoding. This module only provides
+the error type and the lookup of nested generated classes, which the lenient
+decoders (`fromDict`) share.
+"""
+
+from __future__ import annotations
+
+import builtins
+import importlib
+import sys
+from dataclasses import fields
+from typing import Any, Dict, Tuple, Union, get_args, get_origin
+from uuid import UUID
+
+_MISSING = object()
+_classes: Dict[str, type] = {}
+_field_types: Dict[type, Tuple[Tuple[str, Any], ...]] = {}
+
+
+class DecodeError(ValueError):
+    """Raised by strict decoders for the first value which does not match the Rust type.
+
+    `path` locates the value within the decoded document, e.g. `$.items[3].id`.
+    """
+
+    def __init__(self, path: str, message: str, value: Any = _MISSING) -> None:
+        self.path = path
+        self.message = message
+        self.value = value
+        if value is _MISSING:
+            super().__init__("{}: {}".format(path, message))
+        else:
+            got = "null" if value is None else type(value).__name__
+            super().__init__("{}: {}, got {}".format(path, message, got))
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {"path": self.path, "message": self.message}
+        if self.value is not _MISSING:
+            result["value"] = self.value
+        return result
+
+
+def load(name: str) -> type:
+    """Returns the generated class `name` from the module of the same name."""
+    cls = _classes.get(name)
+    if cls is None:
+        cls = _classes[name] = getattr(importlib.import_module(name), name)
+    return cls
+
+
+class _Names(dict):
+    """Names of an annotation, loading the generated classes only imported for type checking."""
+
+    def __init__(self, module_globals: Dict[str, Any]) -> None:
+        super().__init__()
+        self._globals = module_globals
+
+    def __missing__(self, name: str) -> Any:
+        if name in self._globals or hasattr(builtins, name):
+            raise KeyError(name)
+        try:
+            return load(name)
+        except (ImportError, AttributeError):
+            raise KeyError(name) from None
+
+
+def _resolve(annotation: Any, module_globals: Dict[str, Any], names: _Names) -> Any:
+    if isinstance(annotation, str):
+        try:
+            annotation = eval(annotation, module_globals, names)
+        except Exception:
+            return Any
+    return _optional_inner(annotation)
+
+
+def _optional_inner(annotation: Any) -> Any:
+    # `None` is handled by the decoders, so optional values are decoded as their inner type
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def field_types(cls: type) -> Tuple[Tuple[str, Any], ...]:
+    """Returns the name and type of every field of the generated dataclass `cls`.
+
+    Annotations are strings (`from __future__ import annotations`), so they are
+    resolved on first use, loading the classes they refer to. Optional fields
+    resolve to their inner type, and annotations which cannot be resolved to `Any`.
+    """
+    result = _field_types.get(cls)
+    if result is None:
+        module_globals = vars(sys.modules[cls.__module__])
+        names = _Names(module_globals)
+        result = _field_types[cls] = tuple(
+            (f.name, _resolve(f.type, module_globals, names)) for f in fields(cls)
+        )
+    return result
+
+
+def lenient(field_type: Any, value: Any) -> Any:
+    """Converts `value` to `field_type` the way the strict decoders do, without checking it.
+
+    Used by the lenient decoders (`fromDict`): nested classes are decoded, enum
+    members looked up by name, and lists, maps and tuples converted element by
+    element. Values which do not have the expected shape are kept as they are.
+    """
+    if value is None:
+        return None
+    field_type = _optional_inner(field_type)
+    if isinstance(field_type, type):
+        if type(value) is dict and hasattr(field_type, "fromDict"):
+            return field_type.fromDict(value)
+        if type(value) is str:
+            by_name = getattr(field_type, "_BY_NAME", None)
+            if by_name is not None:
+                return by_name.get(value, value)
+            if field_type is UUID:
+                try:
+                    return UUID(value)
+                except ValueError:
+                    return value
+        return value
+    origin, args = get_origin(field_type), get_args(field_type)
+    if type(value) is list:
+        if origin is list and args:
+            return [lenient(args[0], item) for item in value]
+        if origin is tuple and len(args) == len(value):
+            return [lenient(arg, item) for arg, item in zip(args, value)]
+    elif type(value) is dict and origin is dict and len(args) == 2:
+        return {key: lenient(args[1], item) for key, item in value.items()}
+    return value
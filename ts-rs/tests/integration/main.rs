@@ -38,6 +38,12 @@ mod nested;
 mod optional_field;
 mod path_bug;
 mod py_basic;
+mod py_columnar;
+mod py_enum;
+mod py_flatten;
+mod py_instrument;
+mod py_runtime;
+mod py_strict;
 mod ranges;
 mod raw_idents;
 mod recursion_limit;
@@ -0,0 +1,129 @@
+#![allow(dead_code)]
+
+use ts_rs::{Py, TS};
+
+#[derive(TS, Py)]
+#[py(export, export_to = "columnar/")]
+enum Country {
+    De,
+    Fr,
+    Us,
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "columnar/")]
+#[ts(rename_all = "snake_case")]
+enum Tone {
+    DarkRed,
+    LightBlue,
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "columnar/")]
+struct Record {
+    id: u64,
+    score: f32,
+    verified: bool,
+    name: String,
+    nickname: Option<String>,
+    age: Option<u8>,
+    country: Country,
+    tone: Tone,
+    tags: Vec<String>,
+}
+
+#[test]
+fn column_kinds() {
+    assert_eq!(<i32 as Py>::column_kind(), "i32");
+    assert_eq!(<String as Py>::column_kind(), "str");
+    assert_eq!(<Option<f64> as Py>::column_kind(), "?f64");
+    assert_eq!(<Option<Option<u8>> as Py>::column_kind(), "json");
+    assert_eq!(<Vec<u8> as Py>::column_kind(), "json");
+    assert_eq!(<Country as Py>::column_kind(), "enum:De,Fr,Us");
+    assert_eq!(<Tone as Py>::column_kind(), "enum:dark_red,light_blue");
+}
+
+#[test]
+fn columnar_schema() {
+    let definition = <Record as Py>::definition();
+    assert!(definition.contains(
+        r#"    _COLUMNS = (
+        ("id", "u64"),
+        ("score", "f32"),
+        ("verified", "bool"),
+        ("name", "str"),
+        ("nickname", "?str"),
+        ("age", "?u8"),
+        ("country", "enum:De,Fr,Us"),
+        ("tone", "enum:dark_red,light_blue"),
+        ("tags", "json"),
+    )"#
+    ));
+    assert!(definition.contains("_COLUMNAR_FINGERPRINT = 0x"));
+    assert!(definition
+        .contains("def writeColumnar(cls, path: str, records, chunk_rows: int = 65536) -> int:"));
+    assert!(definition.contains("def openColumnar(cls, path: str)"));
+}
+
+#[test]
+fn columnar_round_trip() {
+    let out_dir = crate::py_runtime::bindings_dir("columnar_runtime");
+    <Record as Py>::export_all_to(&out_dir).unwrap();
+    <Country as Py>::export_all_to(&out_dir).unwrap();
+    <Tone as Py>::export_all_to(&out_dir).unwrap();
+
+    crate::py_runtime::run_python(
+        &out_dir.join("columnar"),
+        r#"
+import pickle
+from Country import Country
+from Record import Record
+from Tone import Tone
+
+records = [
+    Record(id=i, score=i / 4, verified=i % 2 == 0, name="name {}".format(i),
+           nickname=None if i % 3 else "nick {}".format(i), age=None if i % 2 else i,
+           country=(Country.De, Country.Fr, Country.Us)[i % 3], tone=(Tone.DarkRed, Tone.LightBlue)[i % 2],
+           tags=["t"] * (i % 4))
+    for i in range(10)
+]
+assert Record.writeColumnar("records.col", records, chunk_rows=4) == 10
+
+with Record.openColumnar("records.col") as f:
+    assert len(f) == 10
+    assert [chunk.rows for chunk in f.chunks] == [4, 4, 2]
+    assert list(f) == records, (list(f), records)
+    assert f[-1] == records[-1]
+    assert f.row(3) == {"id": 3, "score": 0.75, "verified": False, "name": "name 3", "nickname": "nick 3",
+                        "age": None, "country": "De", "tone": "light_blue", "tags": ["t", "t", "t"]}, f.row(3)
+
+    ids = f.column("id")
+    assert [list(view) for view in ids] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert isinstance(ids[0], memoryview)
+    assert list(f.chunks[0].validity("nickname")) == [1, 0, 0, 1]
+    assert f.chunks[0].validity("name") is None
+    assert list(f.chunks[0].column("country")) == [0, 1, 2, 0]
+    assert list(f.chunks[0].column("tone")) == [0, 1, 0, 1]
+    assert f.chunks[1].column("name")[1] == "name 5"
+    del ids
+
+    assert list(pickle.loads(pickle.dumps(f))) == records
+
+# Decoded records hold the serialized names of renamed variants
+decoded = [Record.fromJSON(record.toJSON()) for record in records]
+assert Record.writeColumnar("decoded.col", decoded) == 10
+with Record.openColumnar("decoded.col") as f:
+    assert list(f) == decoded == records
+
+with open("records.col", "r+b") as raw:
+    raw.seek(16)
+    raw.write(b"\0" * 8)
+try:
+    Record.openColumnar("records.col")
+except ValueError as e:
+    assert "does not match" in str(e), e
+else:
+    raise AssertionError("opened a file with a different schema")
+"#,
+    );
+}
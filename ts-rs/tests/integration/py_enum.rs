@@ -0,0 +1,142 @@
+#![allow(dead_code)]
+
+use std::collections::HashMap;
+
+use ts_rs::{Py, TS};
+
+#[derive(TS, Py)]
+#[py(export, export_to = "enum/")]
+enum Country {
+    De,
+    Fr,
+    Us,
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "enum/", repr = "int")]
+enum Priority {
+    Low = 1,
+    Normal,
+    High = 10,
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "enum/")]
+enum Event {
+    Idle,
+    Moved { x: i32, y: i32 },
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "enum/")]
+#[ts(rename_all = "lowercase")]
+enum Channel {
+    Email,
+    Sms,
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "enum/")]
+struct Row {
+    #[py(intern)]
+    sender: String,
+    #[py(intern)]
+    country: Option<String>,
+    #[py(intern)]
+    labels: HashMap<String, Vec<String>>,
+    priority: Priority,
+    channel: Channel,
+}
+
+#[test]
+fn lookup_tables() {
+    let country = <Country as Py>::definition();
+    assert!(country.contains("    _BY_NAME = {\"De\": De, \"Fr\": Fr, \"Us\": Us}\n"));
+    assert!(country.contains("    _BY_VALUE = {0: De, 1: Fr, 2: Us}\n"));
+    assert!(country.contains("            return Country._BY_NAME.get(data, data)\n"));
+
+    let event = <Event as Py>::definition();
+    assert!(event.contains("    _BY_NAME = {\"Idle\": Idle}\n"));
+    assert!(event.contains("    _BY_TAG = {\"Moved\": Moved}\n"));
+}
+
+#[test]
+fn int_repr() {
+    let priority = <Priority as Py>::definition();
+    assert!(priority.contains("    Low = 1\n    Normal = 2\n    High = 10\n"));
+    assert!(priority.contains("    _BY_VALUE = {1: Low, 2: Normal, 10: High}\n"));
+    assert_eq!(<Priority as Py>::column_kind(), "i64");
+}
+
+#[test]
+fn interned_fields() {
+    let row = <Row as Py>::definition();
+    assert!(row.contains(
+        "        value = kwargs.get(\"sender\")\n        if value is not None:\n            kwargs[\"sender\"] = (_ts_rs_intern.intern(value) if type(value) is str else value)\n"
+    ));
+    assert!(row.contains("        f_sender = _ts_rs_intern.intern(f_sender)\n"));
+    assert!(row.contains(
+        "        f_country = (None if f_country is None else _ts_rs_intern.intern(f_country))\n"
+    ));
+    assert!(row.contains(
+        "        f_labels = {_ts_rs_intern.intern(key0): [_ts_rs_intern.intern(item1) for item1 in item0] for key0, item0 in f_labels.items()}\n"
+    ));
+}
+
+#[test]
+fn lookups_runtime() {
+    let out_dir = crate::py_runtime::bindings_dir("enum_runtime");
+    <Country as Py>::export_all_to(&out_dir).unwrap();
+    <Priority as Py>::export_all_to(&out_dir).unwrap();
+    <Event as Py>::export_all_to(&out_dir).unwrap();
+    <Channel as Py>::export_all_to(&out_dir).unwrap();
+    <Row as Py>::export_all_to(&out_dir).unwrap();
+
+    crate::py_runtime::run_python(
+        &out_dir.join("enum"),
+        r#"
+import json
+import _ts_rs_strict
+from Channel import Channel
+from Country import Country
+from Event import Event
+from Priority import Priority
+from Row import Row
+
+assert Country._BY_NAME["Fr"] is Country.Fr
+assert Country._BY_VALUE[2] is Country.Us
+assert Country.fromJSON('"De"') is Country.De
+assert Channel._BY_NAME["Sms"] is Channel._BY_NAME["sms"] is Channel.Sms == "sms"
+assert Event._BY_NAME["Idle"] is Event.Idle
+assert Event._BY_TAG["Moved"] is Event.Moved
+assert Event.fromDictStrict({"type": "Moved", "x": 1, "y": 2}) == Event.Moved(1, 2)
+assert Event.fromDictStrict("Idle") is Event.Idle
+
+data = {"sender": "alice", "country": "de", "labels": {"kind": ["a", "b"]}, "priority": 10, "channel": "sms"}
+for strict in (False, True):
+    row = Row.fromJSON(json.dumps(data), strict=strict)
+    assert row.priority is Priority.High == 10
+    assert row.channel is Channel.Sms
+    assert row._serialize() == data
+    assert Row.fromJSON(row.toJSON(), strict=strict) == row
+
+    # Renamed variants are also found by their Rust names when decoding leniently
+    assert Row.fromDict(dict(data, channel="Sms")).channel is Channel.Sms
+
+    # Interned strings are shared by every decoded record
+    other = Row.fromJSON(json.dumps(data), strict=strict)
+    assert other.sender is row.sender
+    assert other.country is row.country
+    assert next(iter(other.labels)) is next(iter(row.labels))
+    assert all(a is b for a, b in zip(other.labels["kind"], row.labels["kind"]))
+
+assert Row.fromDict(dict(data, priority=2)).priority is Priority.Normal
+try:
+    Row.fromDictStrict(dict(data, priority=3))
+except _ts_rs_strict.DecodeError as e:
+    assert e.path == "$.priority", e.path
+else:
+    raise AssertionError("decoded an unknown discriminant")
+"#,
+    );
+}
@@ -0,0 +1,184 @@
+#![allow(dead_code)]
+
+use ts_rs::{Py, TS};
+
+#[derive(TS, Py)]
+#[py(export, export_to = "flatten/")]
+struct Position {
+    x: i32,
+    y: i32,
+}
+
+#[derive(TS, Py)]
+#[ts(tag = "type")]
+#[py(export, export_to = "flatten/")]
+enum Body {
+    Static,
+    Moving { speed: f64 },
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "flatten/")]
+struct Entity {
+    id: u32,
+    #[ts(flatten)]
+    position: Position,
+    #[ts(flatten)]
+    body: Body,
+    #[py(flatten)]
+    origin: Option<Position>,
+}
+
+#[derive(TS, Py)]
+#[ts(tag = "kind")]
+#[py(export, export_to = "flatten/")]
+enum Event {
+    Start {
+        #[ts(flatten)]
+        at: Position,
+        label: String,
+    },
+    Stop,
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "flatten/")]
+struct Log {
+    seq: u32,
+    #[ts(flatten)]
+    event: Event,
+}
+
+#[test]
+fn flattened_fields() {
+    let definition = <Entity as Py>::definition();
+    assert!(definition.contains("        for key in (\"id\",):\n"));
+    assert!(definition.contains(
+        "        _ts_rs_strict.load(\"Position\")._serialize_into(self.position, result)\n"
+    ));
+    assert!(definition
+        .contains("        _ts_rs_strict.load(\"Body\")._serialize_into(self.body, result)\n"));
+    assert!(definition.contains(
+        "        if self.origin is not None:\n            _ts_rs_strict.load(\"Position\")._serialize_into(self.origin, result)\n"
+    ));
+    assert!(definition.contains(
+        "        kwargs[\"position\"] = _ts_rs_strict.load(\"Position\").fromDict(data)\n"
+    ));
+    assert!(definition
+        .contains("        f_body = _ts_rs_strict.load(\"Body\").fromDictStrict(data, path)\n"));
+    assert!(!definition.contains("__ts_rs_flatten_"));
+}
+
+#[test]
+fn flattened_variant_fields() {
+    let definition = <Event as Py>::definition();
+    assert!(definition.contains("        for key in (\"label\",):\n"));
+    assert!(definition
+        .contains("        _ts_rs_strict.load(\"Position\")._serialize_into(self.at, result)\n"));
+    assert!(definition
+        .contains("        kwargs[\"at\"] = _ts_rs_strict.load(\"Position\").fromDict(data)\n"));
+    assert!(definition
+        .contains("        f_at = _ts_rs_strict.load(\"Position\").fromDictStrict(data, path)\n"));
+    assert!(!definition.contains("__ts_rs_flatten_"));
+}
+
+#[test]
+fn flattened_enum() {
+    assert_eq!(<Body as Py>::inline_flattened(), "Body");
+    let definition = <Body as Py>::definition();
+    assert!(definition.contains("        result[\"type\"] = \"Moving\"\n"));
+    assert!(definition.contains("    def _serialize_into(value, result: dict) -> None:\n"));
+    assert!(definition.contains("    _BY_TAG = {\"Moving\": Moving}\n"));
+}
+
+#[test]
+fn flattened_columns() {
+    let definition = <Entity as Py>::definition();
+    assert!(definition.contains(
+        r#"    _COLUMNS = (
+        ("id", "u32"),
+        ("position", "flatten:Position"),
+        ("body", "flatten:Body"),
+        ("origin", "?flatten:Position"),
+    )"#
+    ));
+
+    let out_dir = crate::py_runtime::bindings_dir("flatten_columns");
+    <Entity as Py>::export_all_to(&out_dir).unwrap();
+    <Position as Py>::export_all_to(&out_dir).unwrap();
+    <Body as Py>::export_all_to(&out_dir).unwrap();
+
+    crate::py_runtime::run_python(
+        &out_dir.join("flatten"),
+        r#"
+from Body import Body
+from Entity import Entity
+from Position import Position
+
+records = [
+    Entity(id=1, position=Position(x=1, y=2), body=Body.Moving(speed=1.5), origin=None),
+    Entity(id=2, position=Position(x=3, y=4), body=Body.Static, origin=Position(x=0, y=-1)),
+]
+Entity.writeColumnar("entities.col", records)
+with Entity.openColumnar("entities.col") as f:
+    assert f.row(0) == {"id": 1, "x": 1, "y": 2, "type": "Moving", "speed": 1.5}, f.row(0)
+    assert f.row(1) == {"id": 2, "x": 0, "y": -1, "type": "Static"}, f.row(1)
+    # `position` and `origin` share their keys, so rows are compared to what the records serialize to
+    for row, (read, record) in enumerate(zip(f, records)):
+        assert f.row(row) == record._serialize(), (f.row(row), record._serialize())
+        assert (read.id, read.body) == (record.id, record.body), read
+"#,
+    );
+}
+
+#[test]
+fn flattened_round_trip() {
+    let out_dir = crate::py_runtime::bindings_dir("flatten_round_trip");
+    <Entity as Py>::export_all_to(&out_dir).unwrap();
+    <Position as Py>::export_all_to(&out_dir).unwrap();
+    <Body as Py>::export_all_to(&out_dir).unwrap();
+    <Event as Py>::export_all_to(&out_dir).unwrap();
+    <Log as Py>::export_all_to(&out_dir).unwrap();
+
+    crate::py_runtime::run_python(
+        &out_dir.join("flatten"),
+        r#"
+import json
+import _ts_rs_strict
+from Body import Body
+from Entity import Entity
+from Event import Event
+from Log import Log
+from Position import Position
+
+cases = [
+    # `origin` is decoded from the same keys as `position`, as serde does
+    (Entity, {"id": 1, "x": 1, "y": 2, "type": "Moving", "speed": 1.5},
+     Entity(id=1, position=Position(1, 2), body=Body.Moving(speed=1.5), origin=Position(1, 2))),
+    (Entity, {"id": 2, "x": 3, "y": 4, "type": "Static"},
+     Entity(id=2, position=Position(3, 4), body=Body.Static, origin=Position(3, 4))),
+    (Log, {"seq": 1, "kind": "Start", "x": 5, "y": 6, "label": "go"},
+     Log(seq=1, event=Event.Start(at=Position(5, 6), label="go"))),
+    (Log, {"seq": 2, "kind": "Stop"}, Log(seq=2, event=Event.Stop)),
+    (Event, {"kind": "Start", "x": 7, "y": 8, "label": "on"}, Event.Start(at=Position(7, 8), label="on")),
+]
+for cls, data, expected in cases:
+    for strict in (False, True):
+        decoded = cls.fromJSON(json.dumps(data), strict=strict)
+        assert decoded == expected, (strict, decoded)
+    assert expected._serialize() == data, expected._serialize()
+
+for data, path in [
+    ({"id": 1, "x": 1, "type": "Static"}, "$.y"),
+    ({"id": 1, "x": 1, "y": 2, "type": "Moving"}, "$.speed"),
+    ({"id": 1, "x": 1, "y": 2, "type": "Flying"}, "$.type"),
+]:
+    try:
+        Entity.fromDictStrict(data)
+    except _ts_rs_strict.DecodeError as e:
+        assert e.path == path, (e.path, path)
+    else:
+        raise AssertionError("decoded {}".format(data))
+"#,
+    );
+}
@@ -0,0 +1,72 @@
+#![allow(dead_code)]
+
+use ts_rs::Py;
+
+#[derive(Py)]
+#[py(export, export_to = "instrument/")]
+struct Instrumented {
+    id: i32,
+    label: String,
+}
+
+#[test]
+fn registers_exported_classes() {
+    let out_dir = crate::py_runtime::bindings_dir("instrument");
+    <Instrumented as Py>::export_all_to(&out_dir).unwrap();
+
+    let file = std::fs::read_to_string(out_dir.join("instrument/Instrumented.py")).unwrap();
+    assert!(file.contains("import _ts_rs_instrument\n"));
+    assert!(file.contains("_ts_rs_instrument.register(Instrumented)\n"));
+
+    let runtime = std::fs::read_to_string(out_dir.join("instrument/_ts_rs_instrument.py")).unwrap();
+    assert!(runtime.contains("def enable("));
+}
+
+#[test]
+fn records_codec_calls() {
+    let out_dir = crate::py_runtime::bindings_dir("instrument_runtime");
+    <Instrumented as Py>::export_all_to(&out_dir).unwrap();
+
+    crate::py_runtime::run_python(
+        &out_dir.join("instrument"),
+        r#"
+import _ts_rs_instrument as instrument
+from Instrumented import Instrumented
+
+text = '{"id": 1, "label": "a"}'
+Instrumented.fromJSON(text)
+assert instrument.snapshot() == {}, "recorded while disabled"
+
+instrument.enable(histogram=True)
+value = Instrumented.fromJSON(text)
+assert (value.id, value.label) == (1, "a")
+encoded = value.toJSON()
+
+snapshot = instrument.snapshot()["Instrumented"]
+assert snapshot["decode"]["calls"] == 1, snapshot
+assert snapshot["decode"]["bytes"] == len(text), snapshot
+
+# the JSON text is measured regardless of how `strict` is passed
+Instrumented.fromJSON(text, True)
+Instrumented.fromJSON(text, strict=True)
+Instrumented.fromJSON(json_str=text)
+snapshot = instrument.snapshot()["Instrumented"]
+assert snapshot["decode"]["calls"] == 4, snapshot
+assert snapshot["decode"]["bytes"] == 4 * len(text), snapshot
+assert snapshot["encode"]["calls"] == 1, snapshot
+assert snapshot["encode"]["bytes"] == len(encoded), snapshot
+assert sum(snapshot["decode"]["histogram"]["counts"]) == 4, snapshot
+
+metrics = instrument.to_prometheus()
+assert 'ts_rs_py_codec_calls_total{type="Instrumented",direction="decode"} 4' in metrics, metrics
+assert 'ts_rs_py_codec_duration_seconds_count{type="Instrumented",direction="encode"} 1' in metrics, metrics
+
+instrument.disable()
+assert not hasattr(Instrumented.__dict__["fromJSON"].__func__, "__wrapped__")
+Instrumented.fromJSON(text)
+assert instrument.snapshot()["Instrumented"]["decode"]["calls"] == 4
+instrument.reset()
+assert instrument.snapshot() == {}
+"#,
+    );
+}
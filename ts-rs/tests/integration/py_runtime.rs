@@ -0,0 +1,45 @@
+//! Runs Python scripts against exported bindings.
+
+use std::{
+    io::ErrorKind,
+    path::{Path, PathBuf},
+    process::Command,
+};
+
+/// Returns an empty directory for the bindings exported by the test `name`, within the system's
+/// temporary directory so that nothing is left in the source tree.
+pub fn bindings_dir(name: &str) -> PathBuf {
+    let dir = std::env::temp_dir().join("ts-rs-py-tests").join(name);
+    if dir.exists() {
+        std::fs::remove_dir_all(&dir).unwrap();
+    }
+    dir
+}
+
+/// Runs `script` with the exported bindings in `dir` importable.
+/// The test is skipped if no Python interpreter can be found.
+pub fn run_python(dir: &Path, script: &str) {
+    for interpreter in ["python3", "python"] {
+        let output = Command::new(interpreter)
+            .arg("-c")
+            .arg(script)
+            .current_dir(dir)
+            .env("PYTHONPATH", ".")
+            .env("PYTHONDONTWRITEBYTECODE", "1")
+            .output();
+        match output {
+            Ok(output) => {
+                assert!(
+                    output.status.success(),
+                    "python script failed\n--- stdout\n{}\n--- stderr\n{}",
+                    String::from_utf8_lossy(&output.stdout),
+                    String::from_utf8_lossy(&output.stderr),
+                );
+                return;
+            }
+            Err(e) if e.kind() == ErrorKind::NotFound => continue,
+            Err(e) => panic!("failed to run {interpreter}: {e}"),
+        }
+    }
+    eprintln!("skipping python script, no interpreter found");
+}
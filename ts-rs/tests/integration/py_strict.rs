@@ -0,0 +1,192 @@
+#![allow(dead_code)]
+
+use std::collections::HashMap;
+
+use ts_rs::{Py, TS};
+
+#[derive(TS, Py)]
+#[py(export, export_to = "strict/")]
+enum Level {
+    Low,
+    High,
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "strict/")]
+enum Shape {
+    Empty,
+    Circle { radius: f64 },
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "strict/")]
+struct Reading {
+    id: u8,
+    label: String,
+    note: Option<String>,
+    samples: Vec<i32>,
+    levels: HashMap<String, Level>,
+    shape: Shape,
+}
+
+#[derive(TS, Py)]
+#[py(export, export_to = "strict/")]
+struct Batch<T> {
+    items: Vec<T>,
+    cursor: Option<String>,
+}
+
+#[derive(TS, Py)]
+#[py(export_to = "strict/")]
+#[ts(rename_all = "snake_case")]
+enum Tone {
+    DarkRed,
+    LightBlue,
+}
+
+#[derive(TS, Py)]
+#[py(export_to = "strict/")]
+#[ts(rename_all = "snake_case")]
+enum Step {
+    Stop,
+    MoveTo { x: i32 },
+}
+
+#[derive(TS, Py)]
+#[py(export_to = "strict/", repr = "int")]
+enum Rank {
+    Low = 1,
+    High = 10,
+}
+
+#[derive(TS, Py)]
+#[py(export_to = "strict/")]
+struct Inner {
+    a: i32,
+}
+
+#[derive(TS, Py)]
+#[py(export_to = "strict/")]
+struct Outer {
+    flag: bool,
+    nested: Vec<Inner>,
+    m: HashMap<String, Inner>,
+    rgb: [u8; 3],
+    rank: Rank,
+    tone: Tone,
+    steps: Vec<Step>,
+}
+
+#[test]
+fn struct_decoder() {
+    let definition = <Reading as Py>::definition();
+    assert!(definition.contains("def fromJSON(cls, json_str: str, strict: bool = False)"));
+    assert!(definition.contains("def fromDictStrict(cls, data: dict, path: str = \"$\")"));
+    assert!(definition.contains(
+        r#"        try:
+            f_id = data["id"]
+        except KeyError:
+            raise _ts_rs_strict.DecodeError(path + ".id", "missing field") from None
+        if type(f_id) is not int or not 0 <= f_id <= 255:
+            raise _ts_rs_strict.DecodeError(path + ".id", "expected u8", f_id)"#
+    ));
+    assert!(definition.contains("        f_note = data.get(\"note\")\n"));
+    assert!(definition.contains(
+        r#"        for i0, item0 in enumerate(f_samples):
+            if type(item0) is not int or not -2147483648 <= item0 <= 2147483647:"#
+    ));
+    assert!(definition.contains(
+        "item0 = _ts_rs_strict.load(\"Level\").fromDictStrict(item0, path + \".levels\" + \"[\" + repr(key0) + \"]\")"
+    ));
+    assert!(definition.contains("return cls(f_id, f_label, f_note, f_samples, f_levels, f_shape)"));
+}
+
+#[test]
+fn enum_decoders() {
+    let level = <Level as Py>::definition();
+    assert!(level.contains("    _BY_NAME = {\"Low\": Low, \"High\": High}\n"));
+    assert!(level.contains("def fromDictStrict(data, path=\"$\"):"));
+
+    let shape = <Shape as Py>::definition();
+    assert!(shape.contains("    _BY_NAME = {\"Empty\": Empty}\n"));
+    assert!(shape.contains("                return variant.fromDictStrict(data, path)\n"));
+}
+
+#[test]
+fn generic_struct() {
+    let batch = <Batch<Level> as Py>::definition();
+    assert!(batch.contains("class Batch:\n"));
+    assert!(batch.contains("def fromDictStrict(cls, data: dict, path: str = \"$\")"));
+}
+
+#[test]
+fn lenient_decoder_defaults_options() {
+    let definition = <Reading as Py>::definition();
+    assert!(definition.contains("        kwargs.setdefault(\"note\", None)\n"));
+    assert!(!definition.contains("kwargs.setdefault(\"label\""));
+
+    let batch = <Batch<Level> as Py>::definition();
+    assert!(batch.contains("        kwargs.setdefault(\"cursor\", None)\n"));
+}
+
+#[test]
+fn strict_runtime() {
+    let out_dir = crate::py_runtime::bindings_dir("strict_runtime");
+    <Tone as Py>::export_all_to(&out_dir).unwrap();
+    <Step as Py>::export_all_to(&out_dir).unwrap();
+    <Rank as Py>::export_all_to(&out_dir).unwrap();
+    <Inner as Py>::export_all_to(&out_dir).unwrap();
+    <Outer as Py>::export_all_to(&out_dir).unwrap();
+
+    crate::py_runtime::run_python(
+        &out_dir.join("strict"),
+        r#"
+import json
+import _ts_rs_strict
+from Inner import Inner
+from Outer import Outer
+from Rank import Rank
+from Step import Step
+from Tone import Tone
+
+valid = {
+    "flag": True,
+    "nested": [{"a": 1}, {"a": 2}],
+    "m": {"k": {"a": 3}},
+    "rgb": [1, 2, 255],
+    "rank": 10,
+    "tone": "dark_red",
+    "steps": ["stop", {"type": "stop"}, {"type": "move_to", "x": 1}],
+}
+
+strict = Outer.fromDictStrict(valid)
+assert strict == Outer.fromDict(valid), (strict, Outer.fromDict(valid))
+assert strict.nested == [Inner(1), Inner(2)]
+assert strict.m == {"k": Inner(3)}
+assert strict.rank == Rank.High
+assert strict.tone == Tone.DarkRed
+assert strict.steps == [Step.Stop, Step.Stop, Step.MoveTo(1)]
+assert Outer.fromDict(dict(valid, tone="DarkRed")).tone == Tone.DarkRed
+assert strict._serialize() == dict(valid, steps=["stop", "stop", {"type": "move_to", "x": 1}])
+assert Outer.fromJSON(json.dumps(valid), strict=True) == strict
+
+def error(**changes):
+    try:
+        Outer.fromDictStrict(dict(valid, **changes))
+    except _ts_rs_strict.DecodeError as e:
+        return e.to_dict()
+    raise AssertionError("decoded {}".format(changes))
+
+assert error(nested=[{"a": 1}, {"a": "2"}]) == {"path": "$.nested[1].a", "message": "expected i32", "value": "2"}
+assert error(m={"k": {}}) == {"path": "$.m['k'].a", "message": "missing field"}
+assert error(rgb=[1, 2]) == {"path": "$.rgb", "message": "expected array of length 3", "value": [1, 2]}
+assert error(rgb=[1, 2, 256]) == {"path": "$.rgb[2]", "message": "expected u8", "value": 256}
+assert error(rank=2) == {"path": "$.rank", "message": "unknown variant 2"}
+assert error(tone="DarkRed") == {"path": "$.tone", "message": "unknown variant 'DarkRed'"}
+assert error(steps=[{"type": "MoveTo", "x": 1}]) == {"path": "$.steps[0].type", "message": "unknown variant 'MoveTo'"}
+assert error(flag=1) == {"path": "$.flag", "message": "expected bool", "value": 1}
+assert error(nested=[{"a": True}]) == {"path": "$.nested[0].a", "message": "expected i32", "value": True}
+assert error(rank=True) == {"path": "$.rank", "message": "expected integer", "value": True}
+"#,
+    );
+}
@@ -31,3 +31,31 @@ struct C {
     bar: DepB,
     biz: B,
 }
+
+#[test]
+fn export_all_writes_merged_file() {
+    let out_dir = std::path::Path::new("./bindings/same_file_export_all");
+    C::export_all_to(out_dir).unwrap();
+
+    let actual_content =
+        std::fs::read_to_string(out_dir.join("same_file_export/types.ts")).unwrap();
+
+    if cfg!(feature = "format") {
+        assert_eq!(actual_content.matches("export type B").count(), 1);
+        assert_eq!(actual_content.matches("export type C").count(), 1);
+        assert_eq!(actual_content.matches("import type { DepA }").count(), 1);
+    } else {
+        assert_eq!(
+            actual_content,
+            concat!(
+                "// This file was generated by [ts-rs](https://github.com/Aleph-Alpha/ts-rs). Do not edit this file manually.\n",
+                "import type { DepA } from \"./DepA\";\n",
+                "import type { DepB } from \"./DepB\";\n",
+                "\n",
+                "export type B = { foo: DepB, };\n",
+                "\n",
+                "export type C = { foo: DepA, bar: DepB, biz: B, };\n",
+            )
+        );
+    }
+}